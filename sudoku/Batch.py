@@ -0,0 +1,115 @@
+import os
+import csv
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .Router import Router
+from .SolveLimits import SolveLimits
+
+logger = logging.getLogger(__name__)
+
+#
+# Batch solving.
+#
+# Every puzzle gets its own Grid, event queue and SolveLimits, and nothing in
+# the sudoku package keeps mutable state at module level, so puzzles can be
+# solved on a thread pool in one process. On a free-threaded (3.13t) build
+# the threads run in parallel; with the GIL they still work, just serially.
+# The process pool is kept for comparison and for GIL builds.
+#
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+def csvToPuzzle(filepath):
+    """
+    Reads a puzzle from a CSV file of 1-based row, column, value lines.
+
+    Args:
+        filepath (str): The CSV file.
+
+    Returns:
+        str: The 81 character puzzle string.
+    """
+    cells = ["."] * 81
+    with open(filepath, newline='') as csvFile:
+        for row in csv.reader(csvFile):
+            cells[(int(row[0]) - 1) * 9 + int(row[1]) - 1] = row[2].strip()
+    return "".join(cells)
+
+def solvePuzzle(puzzle, timeout=None, maxEvents=None, cancelToken=None):
+    """
+    Solves one puzzle on a fresh Grid, through a Router, so puzzles the
+    rules cannot finish go on to the search and every answer is final
+    unless a limit stopped it.
+
+    Args:
+        puzzle (str): An 81 character puzzle string (see Grid.load_string).
+        timeout (float): Optional per-puzzle wall-clock limit in seconds.
+        maxEvents (int): Optional per-puzzle event budget.
+        cancelToken (threading.Event): Optional cancel token. Only usable
+            with the thread executor.
+
+    Returns:
+        tuple: (puzzle, solution string, status, seconds, events).
+    """
+    start = time.perf_counter()
+    limits = SolveLimits(timeout=timeout, maxEvents=maxEvents, cancelToken=cancelToken)
+    grid, record = Router(maxRecords=1).solve(puzzle, limits)
+    return (puzzle, grid.to_string(), record.status, time.perf_counter() - start, limits.events)
+
+#
+# with a store, every puzzle is looked up before any Grid is built and only
+# the misses go to the pool, each distinct puzzle once. the results are
+# written back from this process in one batch, so the workers never touch
+# the store.
+#
+def solveBatch(puzzles, workers=None, executor="thread", timeout=None, maxEvents=None, cancelToken=None, store=None):
+    """
+    Solves a batch of puzzles on a pool of workers.
+
+    Args:
+        puzzles (list): The 81 character puzzle strings.
+        workers (int): The pool size. Defaults to the number of CPUs.
+        executor (str): "thread" or "process".
+        timeout (float): Optional per-puzzle wall-clock limit in seconds.
+        maxEvents (int): Optional per-puzzle event budget.
+        cancelToken (threading.Event): Optional cancel token shared by the
+            whole batch. Only usable with the thread executor.
+        store (ResultStore): Optional store of earlier results.
+
+    Returns:
+        list: One (puzzle, solution string, status, seconds, events) tuple
+            per puzzle, in order. Results from the store carry the cost of
+            the solve that stored them.
+    """
+    if executor not in EXECUTORS:
+        logger.error("unknown executor: %s", executor)
+        return []
+    if executor == "process" and cancelToken is not None:
+        logger.error("a cancel token cannot be shared with worker processes")
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = {}
+    if store is not None:
+        for puzzle in puzzles:
+            if puzzle not in results:
+                stored = store.get(puzzle)
+                if stored is not None:
+                    results[puzzle] = (puzzle,) + tuple(stored)
+        logger.info("solveBatch: %s of %s puzzles found in the store", len(results), len(puzzles))
+        toSolve = list(dict.fromkeys(puzzle for puzzle in puzzles if puzzle not in results))
+    else:
+        toSolve = puzzles
+    count = len(toSolve)
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        chunksize = 1 if executor == "thread" else max(1, count // (workers * 4))
+        solved = list(pool.map(solvePuzzle, toSolve,
+                               [timeout] * count, [maxEvents] * count, [cancelToken] * count,
+                               chunksize=chunksize))
+    if store is None:
+        return solved
+    for result in solved:
+        results[result[0]] = result
+        store.put(*result)
+    store.flush()
+    return [results[puzzle] for puzzle in puzzles]
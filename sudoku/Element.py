@@ -1,4 +1,5 @@
 import logging
+from .Zobrist import KEYS
 
 logger = logging.getLogger(__name__)
 
@@ -6,7 +7,7 @@ class Element:
     """
     Represents an element in a Sudoku grid.
     """
-    def __init__(self, row, column, eventQ):
+    def __init__(self, row, column, eventQ, changes=None, zobrist=None):
         """
         Initializes an Element with a row, column, and event queue.
         
@@ -14,12 +15,19 @@ class Element:
             row (int): The row index of the element.
             column (int): The column index of the element.
             eventQ (queue.Queue): The event queue for logging changes.
+            changes (list): Optional change journal shared with the grid.
+                Every value change is appended so it can be undone.
+            zobrist (ZobristHash): Optional hash of the grid's candidate
+                state, kept up to date on every value change.
         """
         self.values = {1:"", 2:"", 3:"", 4:"", 5:"", 6:"", 7:"", 8:"", 9:""}
         self.final = False
         self.row = row
         self.column = column
         self.events = eventQ
+        self.changes = changes
+        self.zobrist = zobrist
+        self.keys = KEYS[row * 9 + column]
 
     def set(self, value):
         """
@@ -29,11 +37,18 @@ class Element:
             value (int): The value to set (1-9).
         """
         if self.member(value):
+            if self.changes is not None:
+                for removed in self.values:
+                    if removed != value:
+                        self.changes.append(("remove", self, removed))
+            if self.zobrist is not None:
+                for removed in self.values:
+                    if removed != value:
+                        self.zobrist.value ^= self.keys[removed]
             self.values.clear()
             self.values.setdefault(value,"")
             # log this change to the event queue
             self.events.put(["set", self.row, self.column, value])
-            logger.debug("Element.set(): set %s, %s to %s", self.row, self.column, value)
         else:
             logger.error("Element.set(): Value %s is not valid in %s, %s", str(value), str(self.row), str(self.column))
 
@@ -47,11 +62,28 @@ class Element:
         if self.cardinality() != 1:
             if self.member(value):
                 self.values.pop(value)
+                if self.changes is not None:
+                    self.changes.append(("remove", self, value))
+                if self.zobrist is not None:
+                    self.zobrist.value ^= self.keys[value]
                 # log this change to the event queue
                 self.events.put(["remove", self.row, self.column, value])
-                logger.debug("Element.remove(): removed %s from %s, %s", value, self.row, self.column)
         return
 
+    def add(self, value):
+        """
+        Puts a value back as a possible value, keeping the values in order.
+        
+        Args:
+            value (int): The value to add (1-9).
+        """
+        if not self.member(value):
+            self.values = dict.fromkeys(sorted([*self.values, value]), "")
+            if self.changes is not None:
+                self.changes.append(("add", self, value))
+            if self.zobrist is not None:
+                self.zobrist.value ^= self.keys[value]
+
     def cardinality(self):
         """
         Returns the number of possible values for the element.
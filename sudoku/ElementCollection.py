@@ -103,7 +103,7 @@ class ElementCollection:
                 singleVal = list(self.elements[indx].values.keys())[0]
                 singleValues.append(singleVal)
                 if not self.elements[indx].final:
-                    logger.debug("SVR: setting %s %s, indx %s to %s", self.type, self.id, indx, singleVal)
+                    if self.grid.debug: logger.debug("SVR: setting %s %s, indx %s to %s", self.type, self.id, indx, singleVal)
                     self.grid.setValue(self.getRow(indx), self.getCol(indx), singleVal)
 
     def singlePossibleValueRule(self):
@@ -125,10 +125,11 @@ class ElementCollection:
         for indx in range(1,10):
             value = possibleValues.get(indx)
             if value != "x" and value != "" and value != None:
-                logger.debug("SPVR: %s %s", self.type, self.id)
-                logger.debug("values: \n%s", str(self))
-                logger.debug("computed SPVs: %s", possibleValues)
-                logger.debug("SPVR in %s %s: %s can only be at position %s", self.type, self.id, indx, value)
+                if self.grid.debug:
+                    logger.debug("SPVR: %s %s", self.type, self.id)
+                    logger.debug("values: \n%s", self)
+                    logger.debug("computed SPVs: %s", possibleValues)
+                    logger.debug("SPVR in %s %s: %s can only be at position %s", self.type, self.id, indx, value)
                 self.grid.setValue(self.getRow(value), self.getCol(value), indx)
     
     def nakedDoubleValueRule(self):
@@ -147,7 +148,7 @@ class ElementCollection:
                 if existingValue == None:
                     doubleValues[str(valueTuple)] = 1
                 else:
-                    logger.debug("nDVR: in %s, %s found tuple %s", self.type, self.id, str(valueTuple))
+                    if self.grid.debug: logger.debug("nDVR: in %s, %s found tuple %s", self.type, self.id, valueTuple)
                     doubleValues[str(valueTuple)] = existingValue+1
                     foundOne = True
         if foundOne:
@@ -158,7 +159,7 @@ class ElementCollection:
                         if not (len(valueList) == 2 and doubleValueKey != (valueList[0], valueList[1])):
                             self.elements[indx].remove(int(doubleValueKey[1]))
                             self.elements[indx].remove(int(doubleValueKey[4]))
-                        logger.debug("nDVR: after removal: values are\n%s", str(self.elements[indx].values))
+                        if self.grid.debug: logger.debug("nDVR: after removal: values are\n%s", self.elements[indx].values)
     
     def __str__(self):
         """
@@ -0,0 +1,198 @@
+import logging
+from collections import OrderedDict
+from .SudokuV1 import Grid
+from .Search import BacktrackingSearch
+from .SolveLimits import SOLVED, STUCK
+from .ResultStore import FINAL_STATUSES, puzzleKey
+
+logger = logging.getLogger(__name__)
+
+#
+# Hints from cached deduction paths.
+#
+# A puzzle's deduction path is recorded once, by running evaluate with a
+# trace: the steps the rules took, in order (see Grid.traceRule). If the
+# rules get stuck the search finishes the puzzle and the remaining cells are
+# added as "search" steps. The path is cached by puzzle key, and the next
+# hint for a player's current state is the first placement on the path
+# whose cell the player has not filled in yet. No rules run to answer it.
+#
+# The value of a hint is always right, the rules only place values that
+# follow from the givens. The rule name is the rule that placed it on the
+# recorded path, after all the steps before it, removals included. The
+# player may not have made those, so from the player's state the value can
+# take more than that one rule to see.
+#
+# Wrong entries are found against the solution. A puzzle with more than
+# one solution has none; there only entries that clash with a value the
+# rules placed are wrong, since those values are in every solution. A
+# solution taken from a ResultStore is trusted to be the only one.
+#
+class DeductionPath:
+    """
+    The recorded deduction steps and solution of one puzzle.
+    """
+    def __init__(self, puzzle, steps, status, solution=None):
+        """
+        Initializes a path.
+
+        Args:
+            puzzle (str): The puzzle string.
+            steps (list): The (rule, kind, cells, value) steps, in order.
+            status (str): How the solve ended.
+            solution (str): The solution string, if there is a single one.
+        """
+        self.puzzle = puzzle
+        self.steps = steps
+        self.status = status
+        self.solution = solution
+        # the values the rules placed, by cell index, for when there is no solution
+        self.forced = {}
+        for rule, kind, cells, value in steps:
+            if kind == "set" and rule != "search":
+                self.forced[cells[0][0] * 9 + cells[0][1]] = str(value)
+
+    def nextHint(self, state):
+        """
+        Finds the next hint for a player's current state.
+
+        Args:
+            state (str): The player's grid as an 81 character string,
+                givens included, '.' or '0' for empty cells.
+
+        Returns:
+            tuple: A ("mistake", "set", ((row, col),), value) step with the
+                right value if a filled cell is wrong, else the next
+                placement step, or None if there is nothing left to hint.
+        """
+        for indx, char in enumerate(state):
+            if char in ".0":
+                continue
+            right = self.solution[indx] if self.solution is not None else self.forced.get(indx)
+            if right is not None and char != right:
+                return ("mistake", "set", ((indx // 9, indx % 9),), int(right))
+        for step in self.steps:
+            if step[1] == "set":
+                row, col = step[2][0]
+                if state[row * 9 + col] in ".0":
+                    return step
+        return None
+
+#
+# the rules always run, the path is made of their steps. only the search
+# after them is skipped when the store already has the answer.
+#
+def recordPath(puzzle, limits=None, store=None, deadStates=None):
+    """
+    Solves a puzzle once and records its deduction path.
+
+    Args:
+        puzzle (str): An 81 character puzzle string.
+        limits (SolveLimits): Optional limits for the solve.
+        store (ResultStore): Optional store of earlier results. A stored
+            answer is used instead of the search, and a search result is
+            put into it.
+        deadStates (OrderedDict): Optional dead state table for the search,
+            see BacktrackingSearch. The grid is hashed when one is given.
+
+    Returns:
+        DeductionPath: The path.
+    """
+    grid = Grid(hashing=deadStates is not None)
+    grid.load_string(puzzle)
+    steps = []
+    status = grid.evaluate(limits, steps)
+    solution = grid.to_string() if grid.isSolved() else None
+    if status == STUCK:
+        stuck = grid.to_string()
+        stored = store.get(puzzle) if store is not None else None
+        if stored is not None:
+            solution, status = stored[0], stored[1]
+        else:
+            status = BacktrackingSearch(grid, limits, deadStates=deadStates).solve(2)
+            solution = grid.to_string()
+            if store is not None:
+                store.put(puzzle, solution, status)
+        if status != SOLVED:
+            solution = None
+        else:
+            for indx, char in enumerate(stuck):
+                if char == ".":
+                    steps.append(("search", "set", ((indx // 9, indx % 9),), int(solution[indx])))
+    logger.debug("recordPath: %s, %s steps", status, len(steps))
+    return DeductionPath(puzzle, steps, status, solution)
+
+#
+# a recording cut short by a limit is not kept, and the next hint for that
+# puzzle records it again. the search's dead state table is kept for it
+# instead, so the next try skips the subtrees the last one finished and
+# gets further on the same limits.
+#
+class HintCache:
+    """
+    Deduction paths by puzzle key, least recently used out first.
+    """
+    def __init__(self, maxPaths=10000, store=None, maxUnfinished=100):
+        """
+        Initializes the cache.
+
+        Args:
+            maxPaths (int): How many paths to keep.
+            store (ResultStore): Optional store of earlier results, see recordPath.
+            maxUnfinished (int): How many dead state tables to keep for
+                puzzles whose recording was cut short.
+        """
+        self.paths = OrderedDict()
+        self.maxPaths = maxPaths
+        self.store = store
+        self.deadStates = OrderedDict()
+        self.maxUnfinished = maxUnfinished
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, puzzle, limits=None):
+        """
+        Gets a puzzle's deduction path, recording it on a miss. Paths cut
+        short by a limit are returned but not kept.
+
+        Args:
+            puzzle (str): The puzzle string.
+            limits (SolveLimits): Optional limits for a recording solve.
+
+        Returns:
+            DeductionPath: The path.
+        """
+        key = puzzleKey(puzzle)
+        path = self.paths.get(key)
+        if path is not None:
+            self.hits += 1
+            self.paths.move_to_end(key)
+            return path
+        self.misses += 1
+        deadStates = self.deadStates.pop(key, None)
+        if deadStates is None:
+            deadStates = OrderedDict()
+        path = recordPath(key, limits, self.store, deadStates)
+        if path.status in FINAL_STATUSES:
+            self.paths[key] = path
+            if len(self.paths) > self.maxPaths:
+                self.paths.popitem(last=False)
+        elif deadStates:
+            self.deadStates[key] = deadStates
+            if len(self.deadStates) > self.maxUnfinished:
+                self.deadStates.popitem(last=False)
+        return path
+
+    def nextHint(self, puzzle, state, limits=None):
+        """
+        Finds the next hint for a player's current state of a puzzle.
+
+        Args:
+            puzzle (str): The puzzle string.
+            state (str): The player's grid, see DeductionPath.nextHint.
+            limits (SolveLimits): Optional limits for a recording solve.
+
+        Returns:
+            tuple: The hint step, or None.
+        """
+        return self.path(puzzle, limits).nextHint(state)
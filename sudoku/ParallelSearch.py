@@ -0,0 +1,205 @@
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .SudokuV1 import Grid
+from .Search import BacktrackingSearch
+from .SolveLimits import SolveLimits, SOLVED, STUCK, NO_SOLUTION, MULTIPLE_SOLUTIONS
+
+logger = logging.getLogger(__name__)
+
+#
+# Parallel search of one hard puzzle.
+#
+# The top of the search tree is split here: take the open cell with the
+# fewest possible values, try each value and run the rules, and repeat on
+# the results until there are a few subtrees per worker. Each subtree goes
+# to a worker process as a compact Grid snapshot (81 ints) and is searched
+# there with BacktrackingSearch. The splitting is done on a scratch grid,
+# so the caller's grid (and its undo history) is only touched by the first
+# evaluate and by filling in the solution at the end.
+#
+# The pool's shared task queue does the load balancing: there are more
+# subtrees than workers, so a worker that finishes early takes the next
+# one instead of sitting idle. Once enough solutions are in (one, or two to
+# disprove uniqueness) the pending subtrees are cancelled and the running
+# workers are told to stop through a shared event.
+#
+
+# set once in each worker process by the pool initializer
+workerCancelEvent = None
+# the shared event is asked on every this many limit checks, asking it
+# takes a lock shared between the processes
+CANCEL_POLL = 64
+
+def initWorker(cancelEvent):
+    """
+    Pool initializer, hands the shared cancel event to a worker process.
+
+    Args:
+        cancelEvent (multiprocessing.Event): Set when the search is over.
+    """
+    global workerCancelEvent
+    workerCancelEvent = cancelEvent
+
+def searchSubtree(state, maxSolutions):
+    """
+    Searches one subtree in a worker process.
+
+    Args:
+        state (tuple): A Grid snapshot to start from.
+        maxSolutions (int): Stop after this many.
+
+    Returns:
+        tuple: (solutions, status, events, branches).
+    """
+    grid = Grid()
+    grid.restore(state)
+    limits = SolveLimits(cancelToken=workerCancelEvent, pollEvery=CANCEL_POLL)
+    search = BacktrackingSearch(grid, limits)
+    status = search.solve(maxSolutions)
+    return (search.solutions, status, limits.events, limits.branches)
+
+class ParallelSearch:
+    """
+    Splits the search of one grid over a pool of worker processes.
+    """
+    def __init__(self, grid, workers=None, limits=None, tasksPerWorker=4):
+        """
+        Initializes the search.
+
+        Args:
+            grid (Grid): The grid to solve. It is left holding the solution,
+                or the state the rules reached if there is no single solution.
+            workers (int): The pool size. Defaults to the number of CPUs.
+            limits (SolveLimits): Optional deadline, budgets and cancel token.
+                They are checked here; the workers are stopped through the
+                shared event when one is hit.
+            tasksPerWorker (int): How many subtrees to aim for per worker.
+        """
+        self.grid = grid
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.limits = limits if limits is not None else SolveLimits()
+        self.tasksPerWorker = tasksPerWorker
+        self.solutions = []
+
+    def split(self, maxSolutions):
+        """
+        Splits the evaluated grid into subtree snapshots, breadth first, on
+        a scratch grid. Solutions found while splitting go straight into
+        self.solutions.
+
+        Args:
+            maxSolutions (int): Stop splitting once this many are found.
+
+        Returns:
+            list: The subtree snapshots, or None if a limit was hit.
+        """
+        grid = Grid()
+        grid.guessing = True
+        target = self.workers * self.tasksPerWorker
+        frontier = [self.grid.snapshot()]
+        while len(frontier) < target and len(self.solutions) < maxSolutions:
+            nextFrontier = []
+            for state in frontier:
+                grid.restore(state)
+                row, col = grid.mrvCell()
+                mark = len(grid.changes)
+                for val in sorted(grid.Rows[row].elements[col].values):
+                    if self.limits.countBranch() is not None:
+                        return None
+                    grid.setValue(row, col, val)
+                    status = grid.evaluate(self.limits)
+                    if status != SOLVED and status != STUCK:
+                        return None
+                    if grid.isConsistent():
+                        if status == SOLVED:
+                            self.solutions.append(grid.to_string())
+                        else:
+                            nextFrontier.append(grid.snapshot())
+                    grid.rollback(mark)
+            frontier = nextFrontier
+            if not frontier:
+                break
+        logger.info("ParallelSearch: split into %s subtrees", len(frontier))
+        return frontier
+
+    def solve(self, maxSolutions=1):
+        """
+        Searches for solutions in parallel.
+
+        Args:
+            maxSolutions (int): Stop after this many. Use 2 to check uniqueness.
+
+        Returns:
+            str: SOLVED, NO_SOLUTION, MULTIPLE_SOLUTIONS, or a limit status.
+        """
+        self.solutions = []
+        status = self.grid.evaluate(self.limits)
+        if status == SOLVED:
+            self.solutions.append(self.grid.to_string())
+            return SOLVED
+        if status != STUCK:
+            return status
+        if not self.grid.isConsistent():
+            return NO_SOLUTION
+        tasks = self.split(maxSolutions)
+        if tasks is None:
+            return self.limits.status
+        if tasks and len(self.solutions) < maxSolutions:
+            status = self.runTasks(tasks, maxSolutions)
+            if status is not None:
+                return status
+        return self.finish(maxSolutions)
+
+    def runTasks(self, tasks, maxSolutions):
+        """
+        Farms the subtrees out to the pool and collects solutions.
+
+        Args:
+            tasks (list): The subtree snapshots.
+            maxSolutions (int): Stop after this many.
+
+        Returns:
+            str: A limit status if a limit stopped the search, None otherwise.
+        """
+        cancelEvent = multiprocessing.Event()
+        status = None
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=initWorker, initargs=(cancelEvent,)) as pool:
+            pending = {pool.submit(searchSubtree, state, maxSolutions) for state in tasks}
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    solutions, workerStatus, events, branches = future.result()
+                    self.solutions.extend(solutions)
+                    self.limits.events += events
+                    self.limits.branches += branches
+                if len(self.solutions) >= maxSolutions:
+                    break
+                status = self.limits.check()
+                if status is not None:
+                    break
+            cancelEvent.set()
+            for future in pending:
+                future.cancel()
+        logger.info("ParallelSearch: %s solutions, %s branches", len(self.solutions), self.limits.branches)
+        return status
+
+    def finish(self, maxSolutions):
+        """
+        Sets the grid to the solution, if there is a single one.
+
+        Args:
+            maxSolutions (int): The number of solutions that was asked for.
+
+        Returns:
+            str: SOLVED, NO_SOLUTION or MULTIPLE_SOLUTIONS.
+        """
+        # workers finishing together can bring in more than asked for
+        del self.solutions[maxSolutions:]
+        if len(self.solutions) > 1:
+            return MULTIPLE_SOLUTIONS
+        if not self.solutions:
+            return NO_SOLUTION
+        BacktrackingSearch(self.grid).fillIn(self.solutions[0])
+        return SOLVED
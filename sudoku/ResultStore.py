@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+import logging
+from .SolveLimits import SOLVED, NO_SOLUTION, MULTIPLE_SOLUTIONS
+
+logger = logging.getLogger(__name__)
+
+#
+# Persistent result store.
+#
+# A local SQLite file mapping a puzzle key to its solution, status and solve
+# cost, so results outlive the process. The database runs in WAL mode, so
+# any number of processes can read it while one of them writes. Writes are
+# buffered and committed in batches of batchSize in one transaction.
+#
+# Only final answers are stored. A run that a limit stopped early says
+# nothing about the puzzle, so it is not kept.
+#
+FINAL_STATUSES = (SOLVED, NO_SOLUTION, MULTIPLE_SOLUTIONS)
+
+def puzzleKey(puzzle):
+    """
+    Normalizes a puzzle string to its store key ('0' blanks become '.').
+
+    Args:
+        puzzle (str): An 81 character puzzle string.
+
+    Returns:
+        str: The key.
+    """
+    return puzzle.replace("0", ".")
+
+class ResultStore:
+    """
+    File backed map from puzzle key to (solution, status, seconds, events).
+    """
+    def __init__(self, path, batchSize=100, timeout=30.0):
+        """
+        Opens (and creates if needed) the store.
+
+        Args:
+            path (str): The SQLite file.
+            batchSize (int): Buffered writes are committed once this many are pending.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        self.path = path
+        self.batchSize = batchSize
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "puzzle TEXT PRIMARY KEY, solution TEXT NOT NULL, status TEXT NOT NULL, "
+            "seconds REAL NOT NULL, events INTEGER NOT NULL)")
+        self.connection.commit()
+
+    def get(self, puzzle):
+        """
+        Looks up a puzzle.
+
+        Args:
+            puzzle (str): The puzzle string.
+
+        Returns:
+            tuple: (solution, status, seconds, events), or None if not stored.
+        """
+        key = puzzleKey(puzzle)
+        with self.lock:
+            result = self.pending.get(key)
+            if result is not None:
+                return result
+            row = self.connection.execute(
+                "SELECT solution, status, seconds, events FROM results WHERE puzzle = ?", (key,)).fetchone()
+        return row
+
+    def put(self, puzzle, solution, status, seconds=0.0, events=0):
+        """
+        Buffers a result. Results that are not final are ignored.
+
+        Args:
+            puzzle (str): The puzzle string.
+            solution (str): The solution string.
+            status (str): The solve status.
+            seconds (float): What the solve cost in wall-clock time.
+            events (int): What the solve cost in events.
+        """
+        if status not in FINAL_STATUSES:
+            logger.debug("ResultStore: not storing %s result", status)
+            return
+        with self.lock:
+            self.pending[puzzleKey(puzzle)] = (solution, status, seconds, events)
+            if len(self.pending) >= self.batchSize:
+                self.flushLocked()
+
+    def flush(self):
+        """
+        Commits all buffered results.
+        """
+        with self.lock:
+            self.flushLocked()
+
+    def flushLocked(self):
+        """
+        Commits all buffered results. The caller holds self.lock.
+        """
+        if not self.pending:
+            return
+        rows = [(key,) + result for key, result in self.pending.items()]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (puzzle, solution, status, seconds, events) VALUES (?, ?, ?, ?, ?)", rows)
+        logger.info("ResultStore: committed %s results to %s", len(rows), self.path)
+        self.pending.clear()
+
+    def close(self):
+        """
+        Commits buffered results and closes the store.
+        """
+        with self.lock:
+            self.flushLocked()
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def count(self):
+        """
+        Commits buffered results and returns the number of stored results.
+
+        Returns:
+            int: The count.
+        """
+        with self.lock:
+            self.flushLocked()
+            return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
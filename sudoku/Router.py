@@ -0,0 +1,192 @@
+import time
+import logging
+from collections import deque
+from .SudokuV1 import Grid
+from .Search import BacktrackingSearch
+from .SolveLimits import SolveLimits, STUCK
+
+logger = logging.getLogger(__name__)
+
+#
+# Difficulty classifier and engine router.
+#
+# After the givens are set (and cleanUpFromSet has pruned their peers) a
+# few cheap numbers say a lot about how hard a puzzle is: how many clues
+# there are, how many cells are still open, how many of those are already
+# down to one value, and how many possible values the open cells have left.
+#
+# Easy puzzles go to the rules alone (PROPAGATE), with every searching rule
+# on. Hard ones go to the backtracking search (SEARCH) with a lighter set
+# of rules: the search runs evaluate at every guess, and there the fish
+# sweeps cost more time than they save (they rarely cut a branch), while
+# the singles, pairs and locked candidates keep the tree small. A propagate
+# route that gets stuck falls back to the search on the grid as it is,
+# with every rule still on, and that is recorded so the thresholds can be
+# tuned from the records.
+#
+# With a ResultStore, a stored answer is used instead of solving (the
+# STORED route), and final answers are put back into the store.
+#
+PROPAGATE = "propagate"
+SEARCH = "search"
+STORED = "stored"
+
+# the rules switched off on the search route
+SEARCH_RULES_OFF = ("xWing", "swordfish", "jellyfish")
+
+class Classifier:
+    """
+    Picks a route from the pre-solve features of a grid.
+    """
+    def __init__(self, minClues=30, maxDensity=0.40):
+        """
+        Initializes the classifier thresholds.
+
+        Args:
+            minClues (int): Puzzles with at least this many clues are propagated.
+            maxDensity (float): Puzzles whose open cells have at most this
+                fraction of their possible values left are propagated.
+        """
+        self.minClues = minClues
+        self.maxDensity = maxDensity
+
+    def features(self, grid):
+        """
+        Computes the pre-solve features of a grid with its givens set.
+
+        Args:
+            grid (Grid): The grid.
+
+        Returns:
+            dict: clues, open cells, singles, and candidate density.
+        """
+        clues = 0
+        openCells = 0
+        singles = 0
+        candidates = 0
+        for row in grid.Rows:
+            for element in row.elements:
+                if element.final:
+                    clues += 1
+                    continue
+                openCells += 1
+                count = element.cardinality()
+                candidates += count
+                if count == 1:
+                    singles += 1
+        density = candidates / (9 * openCells) if openCells else 0.0
+        return {"clues": clues, "open": openCells, "singles": singles, "density": density}
+
+    def classify(self, features):
+        """
+        Picks a route.
+
+        Args:
+            features (dict): From features().
+
+        Returns:
+            str: PROPAGATE or SEARCH.
+        """
+        if features["clues"] >= self.minClues or features["density"] <= self.maxDensity:
+            return PROPAGATE
+        return SEARCH
+
+class RouteRecord:
+    """
+    What the router chose for one puzzle and what it cost.
+    """
+    def __init__(self, puzzle, features, route):
+        """
+        Initializes a record.
+
+        Args:
+            puzzle (str): The puzzle string.
+            features (dict): The classifier features.
+            route (str): The chosen route.
+        """
+        self.puzzle = puzzle
+        self.features = features
+        self.route = route
+        self.fallback = False
+        self.status = None
+        self.seconds = 0.0
+        self.events = 0
+        self.branches = 0
+
+    def __str__(self):
+        """
+        Returns a string representation of the record.
+
+        Returns:
+            str: A one line summary.
+        """
+        fallback = " (fell back to search)" if self.fallback else ""
+        return (f"{self.route}{fallback}: {self.status} in {self.seconds * 1000:.2f}ms, "
+                f"{self.events} events, {self.branches} branches, features {self.features}")
+
+class Router:
+    """
+    Classifies puzzles, solves them on the chosen engine and keeps records.
+    """
+    def __init__(self, classifier=None, maxRecords=10000, store=None):
+        """
+        Initializes the router.
+
+        Args:
+            classifier (Classifier): Defaults to a Classifier with default thresholds.
+            maxRecords (int): How many of the latest records to keep.
+            store (ResultStore): Optional store of earlier results.
+        """
+        self.classifier = classifier if classifier is not None else Classifier()
+        self.records = deque(maxlen=maxRecords)
+        self.store = store
+        # a record is only logged when this is set, callers read self.records
+        self.debug = logger.isEnabledFor(logging.DEBUG)
+
+    def solve(self, puzzle, limits=None):
+        """
+        Solves a puzzle on the engine the classifier picks.
+
+        Args:
+            puzzle (str): An 81 character puzzle string.
+            limits (SolveLimits): Optional limits for this puzzle.
+
+        Returns:
+            tuple: (grid, RouteRecord). A stored answer comes back as a grid
+                loaded from the stored solution string.
+        """
+        start = time.perf_counter()
+        if limits is None:
+            limits = SolveLimits()
+        grid = Grid()
+        stored = self.store.get(puzzle) if self.store is not None else None
+        if stored is not None:
+            grid.load_string(stored[0])
+            record = RouteRecord(puzzle, None, STORED)
+            record.status = stored[1]
+            record.seconds = time.perf_counter() - start
+            self.records.append(record)
+            if self.debug:
+                logger.debug("Router: %s", record)
+            return grid, record
+        grid.load_string(puzzle)
+        features = self.classifier.features(grid)
+        record = RouteRecord(puzzle, features, self.classifier.classify(features))
+        if record.route == SEARCH:
+            for name in SEARCH_RULES_OFF:
+                grid.rules[name] = False
+        if record.route == PROPAGATE:
+            record.status = grid.evaluate(limits)
+            if record.status == STUCK:
+                record.fallback = True
+        if record.route == SEARCH or record.fallback:
+            record.status = BacktrackingSearch(grid, limits).solve()
+        record.seconds = time.perf_counter() - start
+        record.events = limits.events
+        record.branches = limits.branches
+        if self.store is not None:
+            self.store.put(puzzle, grid.to_string(), record.status, record.seconds, record.events)
+        self.records.append(record)
+        if self.debug:
+            logger.debug("Router: %s", record)
+        return grid, record
@@ -0,0 +1,169 @@
+import logging
+from collections import OrderedDict
+from .SolveLimits import SOLVED, STUCK, NO_SOLUTION, MULTIPLE_SOLUTIONS
+
+logger = logging.getLogger(__name__)
+
+#
+# Bifurcation, for the puzzles the rules cannot finish.
+#
+# Run the rules, and if they get stuck pick the open cell with the fewest
+# possible values, try each value in turn and run the rules again. A guess
+# that leads to a contradiction is undone by rolling the grid's change
+# journal back to where it was before the guess.
+#
+# On a grid built with hashing on, the Zobrist hash of every state whose
+# subtree was searched to the end without a solution goes into a bounded
+# table (least recently used out first), and a guess that lands on one of
+# those states is undone without running the rules again. States cut short
+# by a limit are never marked dead. One search always guesses on the same
+# cell in a given state, so it never reaches a state twice; the table only
+# pays off when it is handed to a later search of the same puzzle, e.g. a
+# retry after a search cut short by a limit (see Hints.HintCache). Grids
+# are built without hashing by default.
+#
+class BacktrackingSearch:
+    """
+    Depth first search over a Grid, with the rules as propagation.
+    """
+    def __init__(self, grid, limits=None, maxDeadStates=100000, deadStates=None):
+        """
+        Initializes the search.
+
+        Args:
+            grid (Grid): The grid to solve. It is left holding the solution,
+                or the state the rules reached if there is no single solution.
+            limits (SolveLimits): Optional deadline, budgets and cancel token.
+                Every guess the rules run on counts as a branch.
+            maxDeadStates (int): The size of the dead state table.
+            deadStates (OrderedDict): Optional dead state table from an
+                earlier search of the same puzzle, added to by this one.
+        """
+        self.grid = grid
+        self.limits = limits
+        self.solutions = []
+        self.deadStates = deadStates if deadStates is not None else OrderedDict()
+        self.maxDeadStates = maxDeadStates
+        self.deadHits = 0
+
+    def solve(self, maxSolutions=1):
+        """
+        Searches for solutions.
+
+        Args:
+            maxSolutions (int): Stop after this many. Use 2 to check uniqueness.
+
+        Returns:
+            str: SOLVED, NO_SOLUTION, MULTIPLE_SOLUTIONS, or a limit status.
+        """
+        self.solutions = []
+        self.maxSolutions = maxSolutions
+        status = self.grid.evaluate(self.limits)
+        if status != SOLVED and status != STUCK:
+            return status
+        rootMark = len(self.grid.changes)
+        self.grid.guessing = True
+        try:
+            status = self.search()
+            if len(self.solutions) == 1 and status is None:
+                if not self.grid.isSolved():
+                    # the search went on looking for a second one
+                    self.grid.rollback(rootMark)
+                    self.fillIn(self.solutions[0])
+                return SOLVED
+            self.grid.rollback(rootMark)
+        finally:
+            self.grid.guessing = False
+        if status is not None:
+            return status
+        if len(self.solutions) > 1:
+            return MULTIPLE_SOLUTIONS
+        return NO_SOLUTION
+
+    def search(self):
+        """
+        Searches below the current (already evaluated) grid state.
+
+        Returns:
+            str: A limit status if a limit stopped the search, None otherwise.
+        """
+        grid = self.grid
+        if not grid.isConsistent():
+            return None
+        if grid.isSolved():
+            self.solutions.append(grid.to_string())
+            return None
+        hashing = grid.zobrist is not None
+        stateHash = grid.zobrist.value if hashing else None
+        found = len(self.solutions)
+        row, col = grid.mrvCell()
+        mark = len(grid.changes)
+        for val in sorted(grid.Rows[row].elements[col].values):
+            logger.debug("search: guessing %s at %s, %s", val, row, col)
+            grid.setValue(row, col, val)
+            guessHash = grid.zobrist.value if hashing else None
+            # a guess on a dead state is undone without running the rules,
+            # it does not count as a branch
+            if hashing and self.isDead(guessHash):
+                grid.rollback(mark)
+                continue
+            if self.limits is not None and self.limits.countBranch() is not None:
+                grid.rollback(mark)
+                break
+            before = len(self.solutions)
+            status = grid.evaluate(self.limits)
+            if status == SOLVED or status == STUCK:
+                status = self.search()
+            if status is None and len(self.solutions) >= self.maxSolutions:
+                # leave the grid as it is, holding the last solution found
+                return None
+            grid.rollback(mark)
+            if status is not None:
+                return status
+            if hashing and len(self.solutions) == before:
+                self.markDead(guessHash)
+        if self.limits is not None and self.limits.status is not None:
+            return self.limits.status
+        if hashing and len(self.solutions) == found:
+            self.markDead(stateHash)
+        return None
+
+    def isDead(self, stateHash):
+        """
+        Checks the dead state table.
+
+        Args:
+            stateHash (int): A Zobrist hash of a candidate state.
+
+        Returns:
+            bool: True if the state is known to have no solution.
+        """
+        if stateHash in self.deadStates:
+            self.deadStates.move_to_end(stateHash)
+            self.deadHits += 1
+            return True
+        return False
+
+    def markDead(self, stateHash):
+        """
+        Records a state known to have no solution, evicting the least recently used.
+
+        Args:
+            stateHash (int): A Zobrist hash of a candidate state.
+        """
+        self.deadStates[stateHash] = None
+        self.deadStates.move_to_end(stateHash)
+        if len(self.deadStates) > self.maxDeadStates:
+            self.deadStates.popitem(last=False)
+
+    def fillIn(self, solution):
+        """
+        Sets every open cell from a solution string.
+
+        Args:
+            solution (str): An 81 character solution string.
+        """
+        for row in self.grid.Rows:
+            for element in row.elements:
+                if not element.final:
+                    self.grid.setValue(element.row, element.column, int(solution[element.row * 9 + element.column]))
@@ -0,0 +1,96 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+#
+# status values returned by Grid.evaluate and the search modes.
+# STUCK is evaluate running out of rules, NO_SOLUTION and MULTIPLE_SOLUTIONS
+# are search results. anything else means a limit stopped the run early
+# and the grid holds a partial (but consistent) result.
+#
+SOLVED = "solved"
+STUCK = "stuck"
+NO_SOLUTION = "no solution"
+MULTIPLE_SOLUTIONS = "multiple solutions"
+TIMEOUT = "timeout"
+EVENT_BUDGET = "event budget"
+BRANCH_BUDGET = "branch budget"
+CANCELLED = "cancelled"
+
+class SolveLimits:
+    """
+    Per-request bounds on how much work a solve is allowed to do.
+    """
+    def __init__(self, timeout=None, maxEvents=None, maxBranches=None, cancelToken=None, pollEvery=1):
+        """
+        Initializes the limits. Any limit left as None is not enforced.
+
+        Args:
+            timeout (float): Wall-clock seconds allowed, measured from now.
+            maxEvents (int): The number of events evaluate may process. Once
+                that many are counted the budget is spent.
+            maxBranches (int): The maximum number of guesses a search may make.
+            cancelToken (threading.Event): Anything with an is_set() method.
+                The solve stops once it reports True.
+            pollEvery (int): Ask the cancel token only on every pollEvery-th
+                check, for tokens that are slow to ask (a multiprocessing.Event
+                goes through a lock shared between processes).
+        """
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.maxEvents = maxEvents
+        self.maxBranches = maxBranches
+        self.cancelToken = cancelToken
+        self.pollEvery = pollEvery
+        self.polls = 0
+        self.events = 0
+        self.branches = 0
+        self.status = None
+
+    def countEvent(self):
+        """
+        Counts one processed event.
+
+        Returns:
+            str: A stop status if a limit has been hit, None otherwise.
+        """
+        self.events += 1
+        return self.check()
+
+    def countBranch(self):
+        """
+        Counts one search branch (guess).
+
+        Returns:
+            str: A stop status if a limit has been hit, None otherwise.
+        """
+        self.branches += 1
+        return self.check()
+
+    def check(self):
+        """
+        Checks all limits. Once a limit is hit the status sticks, so nested
+        callers all see the same reason.
+
+        Returns:
+            str: A stop status if a limit has been hit, None otherwise.
+        """
+        if self.status is not None:
+            return self.status
+        cancelled = False
+        if self.cancelToken is not None:
+            self.polls += 1
+            if self.polls >= self.pollEvery:
+                self.polls = 0
+                cancelled = self.cancelToken.is_set()
+        if cancelled:
+            self.status = CANCELLED
+        elif self.maxEvents is not None and self.events >= self.maxEvents:
+            self.status = EVENT_BUDGET
+        elif self.maxBranches is not None and self.branches > self.maxBranches:
+            self.status = BRANCH_BUDGET
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            self.status = TIMEOUT
+        if self.status is not None:
+            logger.info("SolveLimits: stopping, %s (events %s, branches %s)", self.status, self.events, self.branches)
+        return self.status
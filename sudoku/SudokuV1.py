@@ -1,8 +1,11 @@
 import queue
 import logging
 import csv
+from itertools import combinations
 from .Element import Element
 from .ElementCollection import ElementCollection
+from .SolveLimits import SOLVED, STUCK
+from .Zobrist import ZobristHash
 
 logger = logging.getLogger(__name__)
 
@@ -42,18 +45,52 @@ Row 7 | grid | grid | grid |
 Row 8 |  6   |  7   |  8   |
       +------+------+------+
 '''
+#
+# cell masks for the locked candidates rule, bit row * 9 + col per cell.
+# INTERSECTIONS[subGrid] lists, for each of the 3 rows and 3 columns crossing
+# that sub-grid: (line type, line index, the 3 shared cells, the rest of the
+# sub-grid, the rest of the line).
+#
+ROW_MASKS = tuple(0x1ff << (row * 9) for row in range(9))
+COL_MASKS = tuple(sum(1 << (row * 9 + col) for row in range(9)) for col in range(9))
+SUB_GRID_MASKS = tuple(sum(1 << (row * 9 + col) for row in range(sg // 3 * 3, sg // 3 * 3 + 3)
+                           for col in range(sg % 3 * 3, sg % 3 * 3 + 3)) for sg in range(9))
+INTERSECTIONS = tuple(
+    tuple((lineType, line, SUB_GRID_MASKS[sg] & lineMask, SUB_GRID_MASKS[sg] & ~lineMask, lineMask & ~SUB_GRID_MASKS[sg])
+          for lineType, line, lineMask in
+          [("Row", row, ROW_MASKS[row]) for row in range(sg // 3 * 3, sg // 3 * 3 + 3)] +
+          [("Col", col, COL_MASKS[col]) for col in range(sg % 3 * 3, sg % 3 * 3 + 3)])
+    for sg in range(9))
+
 class Grid:
     """
     Represents a Sudoku grid and provides methods to manipulate and solve it.
     """
-    def __init__(self):
+    def __init__(self, hashing=False):
         """
         Initializes an empty 9x9 Sudoku grid with rows, columns, and sub-grids.
+        
+        Args:
+            hashing (bool): Keep a Zobrist hash of the candidate state, for a
+                search's dead state table. It costs an XOR on every change.
         """
         self.Cols = []
         self.Rows = []
         self.SubGrid = []
         self.events = queue.Queue()
+        # every element change, for rollback, and the edits that can be undone
+        self.changes = []
+        self.history = []
+        self.redoStack = []
+        # hash of which values are still possible, kept up to date by the elements
+        self.zobrist = ZobristHash() if hashing else None
+        # set while a search is guessing, when failed sets are expected
+        self.guessing = False
+        # per-change debug logging is only built when this is set, the
+        # logger is not asked on every change
+        self.debug = logger.isEnabledFor(logging.DEBUG)
+        # searching rules that can be switched off, by name
+        self.rules = {"lockedCandidates": True, "xWing": True, "swordfish": True, "jellyfish": True}
         # create empty grid
         for indx in range(9):
             self.Rows.append(ElementCollection(indx, "Row", self))
@@ -63,7 +100,7 @@ class Grid:
         # place them in the right row, column, and sub grid
         for row in range(9):
             for col in range(9):
-                el = Element(row, col, self.events)
+                el = Element(row, col, self.events, self.changes, self.zobrist)
                 self.Rows[row].append_element(el)
                 self.Cols[col].append_element(el)
                 self.SubGrid[self.subGridIndex(row,col)].append_element(el)
@@ -92,14 +129,20 @@ class Grid:
         rowAlreadySet = self.Rows[row].checkIfAlreadySet(val)
         colAlreadySet = self.Cols[col].checkIfAlreadySet(val)
         sgAlreadySet = self.SubGrid[self.subGridIndex(row,col)].checkIfAlreadySet(val)
+        level = logging.DEBUG if self.guessing else logging.ERROR
+        if not self.Rows[row].elements[col].member(val):
+            # the rules already removed it, so it cannot be final here
+            logger.log(level, "cannot set %s, %s to %s, not a possible value", row, col, val)
+            return
         if not rowAlreadySet and not colAlreadySet and not sgAlreadySet:
             self.Rows[row].elements[col].set(val)
             self.Rows[row].elements[col].final = True
+            self.changes.append(("final", self.Rows[row].elements[col], False))
         else:
-            logger.error("cannot set %s, %s to %s", row, col, val)
-            if rowAlreadySet: logger.error("row already has %s", val)
-            if colAlreadySet: logger.error("col already has %s", val)
-            if sgAlreadySet: logger.error("sub grid already has %s", val)
+            logger.log(level, "cannot set %s, %s to %s", row, col, val)
+            if rowAlreadySet: logger.log(level, "row already has %s", val)
+            if colAlreadySet: logger.log(level, "col already has %s", val)
+            if sgAlreadySet: logger.log(level, "sub grid already has %s", val)
             return
             
         self.cleanUpFromSet(row, col, val)
@@ -133,76 +176,521 @@ class Grid:
         return solved
     
     #
-    # this one only runs on sub-grids
+    # a contradiction shows up as a value that has nowhere left to go in a
+    # row, column or sub-grid, or as two cells of one collection that are
+    # down to the same single value. Element.remove never empties a cell.
+    #
+    def isConsistent(self):
+        """
+        Checks the grid for contradictions.
+        
+        Returns:
+            bool: True if no collection is broken, False otherwise.
+        """
+        for collection in self.Rows + self.Cols + self.SubGrid:
+            possible = set()
+            singles = set()
+            for element in collection.elements:
+                possible.update(element.values)
+                if element.cardinality() == 1:
+                    single = next(iter(element.values))
+                    if single in singles:
+                        return False
+                    singles.add(single)
+            if len(possible) != 9:
+                return False
+        return True
+
+    def mrvCell(self):
+        """
+        Finds the open cell with the fewest possible values (minimum remaining values).
+        
+        Returns:
+            tuple: (row, col) of the cell, or None if every cell is final.
+        """
+        best = None
+        bestCount = 10
+        for row in self.Rows:
+            for element in row.elements:
+                if not element.final and element.cardinality() < bestCount:
+                    best = (element.row, element.column)
+                    bestCount = element.cardinality()
+                    if bestCount == 2:
+                        return best
+        return best
+
+    #
+    # a snapshot is a compact copy of the grid state: one int per cell, read
+    # row by row, with bit val-1 set for each possible value and bit 9 set if
+    # the value is final. restoring one drops any pending events and the
+    # undo history.
+    #
+    def snapshot(self):
+        """
+        Takes a compact snapshot of the grid state.
+        
+        Returns:
+            tuple: 81 ints, see above.
+        """
+        state = []
+        for row in self.Rows:
+            for element in row.elements:
+                mask = 512 if element.final else 0
+                for val in element.values:
+                    mask |= 1 << (val - 1)
+                state.append(mask)
+        return tuple(state)
+
+    def restore(self, state):
+        """
+        Puts the grid back to a snapshot.
+        
+        Args:
+            state (tuple): A snapshot from snapshot().
+        """
+        for row in self.Rows:
+            for element in row.elements:
+                mask = state[element.row * 9 + element.column]
+                element.values = {val:"" for val in range(1, 10) if mask & (1 << (val - 1))}
+                element.final = bool(mask & 512)
+        if self.zobrist is not None:
+            self.zobrist.recompute(self)
+        # the journal no longer leads back to earlier states
+        self.changes.clear()
+        self.history.clear()
+        self.redoStack.clear()
+        self.dropEvents()
+
+    def dropEvents(self):
+        """
+        Drops any pending events.
+        """
+        try:
+            while True:
+                self.events.get(block=False)
+        except queue.Empty:
+            pass
+
+    #
+    # undo support.
+    # every change to an element is appended to self.changes, so the grid can
+    # be rolled back to any earlier length of that list. edits made through
+    # enterValue and unset are kept in self.history together with the journal
+    # length before them, so they can be undone and redone. undoing an edit
+    # also rolls back whatever the rules did after it.
+    #
+    def rollback(self, mark):
+        """
+        Reverts every change made since the journal had mark entries.
+        
+        Args:
+            mark (int): An earlier len(self.changes).
+        """
+        for kind, element, val in reversed(self.changes[mark:]):
+            if kind == "remove":
+                element.values = dict.fromkeys(sorted([*element.values, val]), "")
+                if self.zobrist is not None:
+                    self.zobrist.value ^= element.keys[val]
+            elif kind == "add":
+                element.values.pop(val)
+                if self.zobrist is not None:
+                    self.zobrist.value ^= element.keys[val]
+            else:
+                element.final = val
+        del self.changes[mark:]
+        self.dropEvents()
+
+    def enterValue(self, row, col, val):
+        """
+        Sets a value as an edit that can be undone.
+        
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+            val (int): The value to set (1-9).
+        """
+        if self.applyEdit(("set", row, col, val)):
+            self.redoStack.clear()
+
+    def unset(self, row, col):
+        """
+        Removes a final value as an edit that can be undone.
+        
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        """
+        if self.applyEdit(("unset", row, col)):
+            self.redoStack.clear()
+
+    def undo(self):
+        """
+        Undoes the last edit.
+        
+        Returns:
+            bool: True if there was an edit to undo.
+        """
+        if not self.history:
+            logger.info("undo: nothing to undo")
+            return False
+        edit, mark = self.history.pop()
+        self.rollback(mark)
+        self.redoStack.append(edit)
+        logger.debug("undo: %s", edit)
+        return True
+
+    def redo(self):
+        """
+        Redoes the last undone edit.
+        
+        Returns:
+            bool: True if there was an edit to redo.
+        """
+        if not self.redoStack:
+            logger.info("redo: nothing to redo")
+            return False
+        edit = self.redoStack.pop()
+        logger.debug("redo: %s", edit)
+        return self.applyEdit(edit)
+
+    def applyEdit(self, edit):
+        """
+        Applies an edit and records it in the history if it changed anything.
+        
+        Args:
+            edit (tuple): ("set", row, col, val) or ("unset", row, col).
+        
+        Returns:
+            bool: True if the edit changed the grid.
+        """
+        mark = len(self.changes)
+        if edit[0] == "set":
+            self.setValue(edit[1], edit[2], edit[3])
+        else:
+            self.clearValue(edit[1], edit[2])
+        if len(self.changes) == mark:
+            return False
+        self.history.append((edit, mark))
+        return True
+
+    #
+    # unsetting a value has to take back everything that followed from it:
+    # the values the rules placed because of it and the values they removed.
+    # if the value came from an edit, the grid goes back to how it was before
+    # that edit, and the later edits are made again without it. an unset in
+    # the history takes back the set of its cell before it; a set taken back
+    # at or after the point the grid goes back to is left out of the replay
+    # with its unset, and the grid goes back to before that set too, so none
+    # of what it caused is kept. going back only touches the cells the
+    # journal changed since then, and is made through the journal, so the
+    # unset can be undone like any other edit. propagation then only runs
+    # locally: naked singles among the cells the replay changed are placed,
+    # and so on from the cells those placements change. cells the user
+    # cleared are left open. deductions the rules made after the edit that
+    # did not need it are not replayed; the next evaluate finds them again.
+    #
+    # a value that did not come from an edit (a given, or one the rules
+    # found) is cleared locally: the cell gets back every value not final
+    # in its row, column or sub-grid, and its open peers get the value back
+    # unless it is final somewhere they see.
+    #
+    def clearValue(self, row, col):
+        """
+        Removes the final value from a cell and takes back what followed from it.
+        
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        """
+        element = self.Rows[row].elements[col]
+        if not element.final:
+            logger.error("cannot unset %s, %s, it has no final value", row, col)
+            return
+        val = next(iter(element.values))
+        for indx in range(len(self.history) - 1, -1, -1):
+            edit, mark = self.history[indx]
+            if edit[1] == row and edit[2] == col:
+                if edit[0] == "set":
+                    self.clearEdit(indx)
+                    logger.debug("unset %s, %s (was %s, edit %s)", row, col, val, indx)
+                    return
+                break
+        self.clearPlaced(row, col)
+        logger.debug("unset %s, %s (was %s)", row, col, val)
+
+    def clearPlaced(self, row, col):
+        """
+        Clears a final value that did not come from an edit, see clearValue.
+        
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        """
+        element = self.Rows[row].elements[col]
+        val = next(iter(element.values))
+        element.final = False
+        self.changes.append(("final", element, True))
+        collections = (self.Rows[row], self.Cols[col], self.SubGrid[self.subGridIndex(row,col)])
+        for possible in range(1, 10):
+            if not self.isPlaced(row, col, possible):
+                element.add(possible)
+        for collection in collections:
+            for peer in collection.elements:
+                if not peer.final and not peer.member(val) and not self.isPlaced(peer.row, peer.column, val):
+                    peer.add(val)
+
+    def clearEdit(self, indx):
+        """
+        Works the grid out again without the set edit at self.history[indx].
+        
+        Args:
+            indx (int): The index of the edit in self.history.
+        """
+        # the set each unset in the history took back, by index
+        takenBack = {}
+        lastEdit = {}
+        for later, (edit, mark) in enumerate(self.history):
+            cell = (edit[1], edit[2])
+            if edit[0] == "unset" and cell in lastEdit and self.history[lastEdit[cell]][0][0] == "set":
+                takenBack[lastEdit[cell]] = later
+            lastEdit[cell] = later
+        start = indx
+        moved = True
+        while moved:
+            moved = False
+            for setIndx, unsetIndx in takenBack.items():
+                if setIndx < start <= unsetIndx:
+                    start = setIndx
+                    moved = True
+        skip = {indx}
+        for setIndx, unsetIndx in takenBack.items():
+            if setIndx >= start:
+                skip.update((setIndx, unsetIndx))
+        self.revertCells(self.history[start][1])
+        mark = len(self.changes)
+        for later in range(start, len(self.history)):
+            if later in skip:
+                continue
+            edit = self.history[later][0]
+            if edit[0] == "set":
+                self.setValue(edit[1], edit[2], edit[3])
+            elif self.Rows[edit[1]].elements[edit[2]].final:
+                self.clearPlaced(edit[1], edit[2])
+        cleared = {(edit[1], edit[2]) for edit, editMark in self.history if edit[0] == "unset"}
+        cleared.add(tuple(self.history[indx][0][1:3]))
+        self.placeSingles([change[1] for change in self.changes[mark:]], cleared)
+
+    def placeSingles(self, elements, cleared):
+        """
+        Places the naked singles among some cells, and among the cells
+        those placements change, until there are none left.
+        
+        Args:
+            elements (list): The cells to start from.
+            cleared (set): (row, col) of cells to leave open.
+        """
+        work = list(elements)
+        while work:
+            element = work.pop()
+            if element.final or element.cardinality() != 1 or (element.row, element.column) in cleared:
+                continue
+            mark = len(self.changes)
+            self.setValue(element.row, element.column, next(iter(element.values)))
+            work.extend(change[1] for change in self.changes[mark:])
+
+    def revertCells(self, mark):
+        """
+        Puts the cells changed since the journal had mark entries back as
+        they were then, through new journal entries so it can be rolled back.
+        
+        Args:
+            mark (int): An earlier len(self.changes).
+        """
+        before = {}
+        for kind, element, val in reversed(self.changes[mark:]):
+            state = before.get(element)
+            if state is None:
+                state = before[element] = [set(element.values), element.final]
+            if kind == "remove":
+                state[0].add(val)
+            elif kind == "add":
+                state[0].discard(val)
+            else:
+                state[1] = val
+        for element, (values, final) in before.items():
+            for val in values.difference(element.values):
+                self.changes.append(("add", element, val))
+                if self.zobrist is not None:
+                    self.zobrist.value ^= element.keys[val]
+            for val in set(element.values).difference(values):
+                self.changes.append(("remove", element, val))
+                if self.zobrist is not None:
+                    self.zobrist.value ^= element.keys[val]
+            element.values = dict.fromkeys(sorted(values), "")
+            if element.final != final:
+                self.changes.append(("final", element, element.final))
+                element.final = final
+
+    def isPlaced(self, row, col, val):
+        """
+        Checks if a value is final anywhere in a cell's row, column or sub-grid.
+        
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+            val (int): The value (1-9).
+        
+        Returns:
+            bool: True if the value is already placed.
+        """
+        return (self.Rows[row].checkIfAlreadySet(val) or self.Cols[col].checkIfAlreadySet(val)
+                or self.SubGrid[self.subGridIndex(row,col)].checkIfAlreadySet(val))
+
     #
-    # in any sub-grid, if one row or column is the only possibility for a value, then
-    # that value possibility can be removed from the rest of the row or column.
+    # locked candidates, both directions, where a sub-grid meets a row or column:
+    #    pointing - if a value in a sub-grid can only be in one row (or column),
+    #               it can be removed from the rest of that row (or column).
+    #    claiming - if a value in a row (or column) can only be in one sub-grid,
+    #               it can be removed from the rest of that sub-grid.
+    # with a value's possible cells as an 81 bit mask, each of the 54
+    # sub-grid/line intersections is a couple of ANDs against the precomputed
+    # masks in INTERSECTIONS.
     #
+    def candidateMasks(self):
+        """
+        Builds, for each value, the mask of open cells it can still go in.
+        Bit row * 9 + col is set if val is possible at row, col.
+        
+        Returns:
+            list: The masks, indexed by value (index 0 is unused).
+        """
+        masks = [0] * 10
+        for row in self.Rows:
+            for elem in row.elements:
+                if elem.final:
+                    continue
+                bit = 1 << (elem.row * 9 + elem.column)
+                for val in elem.values:
+                    masks[val] |= bit
+        return masks
+
+    def lockedCandidatesRule(self, masks=None, subGrids=range(9)):
+        """
+        Applies the locked candidates rule (pointing and claiming).
+        
+        Args:
+            masks (list): Optional masks from candidateMasks().
+            subGrids (iterable): The sub-grid indexes to look at.
+        """
+        if masks is None:
+            masks = self.candidateMasks()
+        for val in range(1, 10):
+            mask = masks[val]
+            for sgIndx in subGrids:
+                for lineType, line, segment, boxRest, lineRest in INTERSECTIONS[sgIndx]:
+                    if not mask & segment:
+                        continue
+                    if not mask & boxRest:
+                        removeMask = mask & lineRest
+                        kind = "pointing"
+                    elif not mask & lineRest:
+                        removeMask = mask & boxRest
+                        kind = "claiming"
+                    else:
+                        continue
+                    if removeMask:
+                        if self.debug: logger.debug("LCR: %s %s in sub grid %s, %s %s", kind, val, sgIndx, lineType, line)
+                        self.removeFromMask(val, removeMask)
+                        mask &= ~removeMask
+            masks[val] = mask
+
     def pointingPairsRule(self, subGrid):
         """
-        Applies the pointing pairs rule to a sub-grid.
+        Applies the locked candidates rule (pointing and claiming) to a sub-grid.
         
         Args:
             subGrid (ElementCollection): The sub-grid to apply the rule to.
         """
         if subGrid.type != "SubGrid":
             return
+        self.lockedCandidatesRule(subGrids=(subGrid.id,))
+
+    def removeFromMask(self, val, mask):
+        """
+        Removes a value from every cell in a cell mask.
         
-        # what rows or cols the values appear
-        rows = {1:[0,0,0], 2:[0,0,0], 3:[0,0,0], 4:[0,0,0], 5:[0,0,0], 6:[0,0,0], 7:[0,0,0], 8:[0,0,0], 9:[0,0,0]}
-        cols = {1:[0,0,0], 2:[0,0,0], 3:[0,0,0], 4:[0,0,0], 5:[0,0,0], 6:[0,0,0], 7:[0,0,0], 8:[0,0,0], 9:[0,0,0]}
-    
-        # create lists of how many times values appear in what rows and columns
-        for indx in range(9):
-            if subGrid.elements[indx].final: 
-                continue
-            row = indx // 3
-            col = indx % 3
-            valueList = list(subGrid.elements[indx].values.keys())
-            for val in valueList.__iter__():
-                rows[val][row] = rows[val][row] + 1
-                cols[val][col] = cols[val][col] + 1
-
-        logger.debug("grid %s", subGrid.id)
-        logger.debug("PPR: rows: %s", rows)
-        logger.debug("PPR: cols: %s", cols)
-
-        # look for [>1,0,0] (in any order)
-        rowPairs = {}
-        colPairs = {}
-        foundRow = False
-        foundCol = False
-        for indx in range(1,10):
-            rowList = rows[indx]
-            if rowList[0] == 0 and rowList[1] == 0 and rowList[2] > 1: rowPairs[indx] = 2; foundRow = True
-            if rowList[0] == 0 and rowList[2] == 0 and rowList[1] > 1: rowPairs[indx] = 1; foundRow = True
-            if rowList[1] == 0 and rowList[2] == 0 and rowList[0] > 1: rowPairs[indx] = 0; foundRow = True
-            colList = cols[indx]
-            if colList[0] == 0 and colList[1] == 0 and colList[2] > 1: colPairs[indx] = 2; foundCol = True
-            if colList[0] == 0 and colList[2] == 0 and colList[1] > 1: colPairs[indx] = 1; foundCol = True
-            if colList[1] == 0 and colList[2] == 0 and colList[0] > 1: colPairs[indx] = 0; foundCol = True
-
-        logger.debug("PPR: rowPairs: %s", rowPairs)
-        logger.debug("PPR: colPairs: %s", colPairs)
-            
-        # if pairs found, remove values from rows and columns
-        for rowVal in rowPairs:
-            rowIndex = (subGrid.id // 3) * 3 + rowPairs[rowVal]
-            colIndex = subGrid.id % 3
-            rowCollction = self.Rows[rowIndex]
-            logger.debug("PPR: removing %s from row %s", rowVal, rowIndex)
-            for indx in range(9):
-                if indx // 3 != colIndex:
-                    rowCollction.elements[indx].remove(rowVal)
-        for colVal in colPairs:
-            colIndex = (subGrid.id % 3) * 3 + colPairs[colVal]
-            rowIndex = subGrid.id // 3
-            colCollction = self.Cols[colIndex]
-            logger.debug("PPR: removing %s from column %s", colVal, colIndex)
-            for indx in range(9):
-                if indx // 3 != rowIndex:
-                    colCollction.elements[indx].remove(colVal)
-    
+        Args:
+            val (int): The value to remove.
+            mask (int): Bit row * 9 + col for each cell.
+        """
+        while mask:
+            low = mask & -mask
+            indx = low.bit_length() - 1
+            self.Rows[indx // 9].elements[indx % 9].remove(val)
+            mask ^= low
+
+    #
+    # for each value, where it can still go in every row and column.
+    # rowMasks[val][row] has bit col set if val is a candidate at row, col
+    # and colMasks[val][col] has bit row set. cells with a final value are
+    # left out, so a row or column that already has val placed is 0.
+    #
+    def digitMasks(self):
+        """
+        Builds the per value row and column position bitmasks.
+        
+        Returns:
+            tuple: (rowMasks, colMasks), each indexed [val][row or col].
+        """
+        rowMasks = [[0] * 9 for _ in range(10)]
+        colMasks = [[0] * 9 for _ in range(10)]
+        for row in range(9):
+            for elem in self.Rows[row].elements:
+                if elem.final:
+                    continue
+                col = elem.column
+                for val in elem.values:
+                    rowMasks[val][row] |= 1 << col
+                    colMasks[val][col] |= 1 << row
+        return rowMasks, colMasks
+
+    #
+    # fish rules: X-Wing (size 2), Swordfish (size 3), Jellyfish (size 4).
+    # if a value is confined to the same size columns in size rows, then it
+    # has to be in those columns in those rows, and can be removed from the
+    # rest of those columns. the same holds with rows and columns swapped.
+    #
+    def fishRule(self, size, masks=None):
+        """
+        Applies the fish rule of a given size to the whole grid.
+        
+        Args:
+            size (int): The number of base rows or columns (2, 3 or 4).
+            masks (tuple): Optional (rowMasks, colMasks) from digitMasks().
+                Masks that are a little stale are fine, values only ever go away.
+        """
+        if masks is None:
+            masks = self.digitMasks()
+        rowMasks, colMasks = masks
+        for val in range(1, 10):
+            for baseType, baseMasks, coverCollections in (("Row", rowMasks[val], self.Cols), ("Col", colMasks[val], self.Rows)):
+                lines = [indx for indx in range(9) if 0 < baseMasks[indx] and baseMasks[indx].bit_count() <= size]
+                if len(lines) < size:
+                    continue
+                for baseLines in combinations(lines, size):
+                    union = 0
+                    for line in baseLines:
+                        union |= baseMasks[line]
+                    if union.bit_count() != size:
+                        continue
+                    if self.debug: logger.debug("fish %s: %s %s on %s, cover %s", size, val, baseType, baseLines, bin(union))
+                    for cover in range(9):
+                        if union & (1 << cover):
+                            elements = coverCollections[cover].elements
+                            for indx in range(9):
+                                if indx not in baseLines:
+                                    elements[indx].remove(val)
+
     #
     # this is the rule evaluator that solves the puzzle.
     # there are two types of rules:
@@ -210,25 +698,45 @@ class Grid:
     #    2. search rules that need to go through the whole grid, and hopefully find new actions
     # the initial value setting of the grid are the first actions.
     # when no new actions are found the evaluation quits.
+    #
+    # limits are checked before every event and once per collection in the
+    # sweep, always between rules, so the grid is never left half way through
+    # a rule, and a run that is already cancelled or out of time does no work.
+    #
+    # with a trace list, every rule that changed something appends its steps
+    # to it (see traceRule), which gives the deduction path of the puzzle.
     # 
-    def evaluate(self):
+    def evaluate(self, limits=None, trace=None):
         """
         Evaluates the Sudoku grid and applies rules to solve it.
+        
+        Args:
+            limits (SolveLimits): Optional deadline, budgets and cancel token.
+            trace (list): Optional list to record the deduction steps in.
+        
+        Returns:
+            str: SOLVED, STUCK, or the status of the limit that stopped it.
         """
         # check to see if solved. can exit early with some events left.
         while self.events.not_empty and not self.isSolved():
+            if limits is not None and limits.check() is not None:
+                return limits.status
             try:
                 #
                 # Reactive Rules - rules that are tirggered by some other action
                 #
                 event = self.events.get(block=False)
-                logger.debug("evaluating: %s", event)
+                if self.debug: logger.debug("evaluating: %s", event)
                 name = event[0]
                 row = event[1]
                 col = event[2]
+                mark = len(self.changes)
                 self.Cols[col].singleValueRule()
                 self.Rows[row].singleValueRule()
                 self.SubGrid[self.subGridIndex(row,col)].singleValueRule()
+                if trace is not None: self.traceRule(trace, "nakedSingle", mark)
+                # the check at the top of the loop stops the next one
+                if limits is not None: limits.countEvent()
                                 
             except queue.Empty:
                 #
@@ -240,35 +748,104 @@ class Grid:
                 # Row Rules
                 #
                 for row in range(9):
+                    mark = len(self.changes)
                     self.Rows[row].singlePossibleValueRule()
+                    if trace is not None: mark = self.traceRule(trace, "hiddenSingle", mark)
                     self.Rows[row].nakedDoubleValueRule()
+                    if trace is not None: self.traceRule(trace, "nakedPair", mark)
+                    if limits is not None and limits.check() is not None:
+                        return limits.status
 
                 #
                 # Column Rules
                 #
                 for col in range(9):
+                    mark = len(self.changes)
                     self.Cols[col].singlePossibleValueRule()
+                    if trace is not None: mark = self.traceRule(trace, "hiddenSingle", mark)
                     self.Cols[col].nakedDoubleValueRule()
+                    if trace is not None: self.traceRule(trace, "nakedPair", mark)
+                    if limits is not None and limits.check() is not None:
+                        return limits.status
 
                 #
                 # Sub-Grid Rules
                 #
                 for indx in range(9):
+                    mark = len(self.changes)
                     self.SubGrid[indx].singlePossibleValueRule()
+                    if trace is not None: mark = self.traceRule(trace, "hiddenSingle", mark)
                     self.SubGrid[indx].nakedDoubleValueRule()
+                    if trace is not None: self.traceRule(trace, "nakedPair", mark)
+                    if limits is not None and limits.check() is not None:
+                        return limits.status
+
+                #
+                # Sub-Grid / Line Rules
+                #
+                # for debug purposes. pretty_print is too costly to build
+                # on every sweep when debug logging is off.
+                if self.debug: logger.debug("\n%s", self.pretty_print())
+                if self.rules["lockedCandidates"]:
+                    mark = len(self.changes)
+                    self.lockedCandidatesRule()
+                    if trace is not None: self.traceRule(trace, "lockedCandidates", mark)
+                if self.debug: logger.debug("\n%s", self.pretty_print())
+                if limits is not None and limits.check() is not None:
+                    return limits.status
 
-                    # for debug purposes
-                    logger.debug("\n%s",self.pretty_print())
-                    self.pointingPairsRule(self.SubGrid[indx])                
-                    # for debug purposes
-                    logger.debug("\n%s", self.pretty_print())
+                #
+                # Fish Rules - one set of masks for all sizes
+                #
+                masks = self.digitMasks()
+                for size, name in ((2, "xWing"), (3, "swordfish"), (4, "jellyfish")):
+                    if self.rules[name]:
+                        mark = len(self.changes)
+                        self.fishRule(size, masks)
+                        if trace is not None: self.traceRule(trace, name, mark)
+                if limits is not None and limits.check() is not None:
+                    return limits.status
 
                 # if no changes, quit
                 if self.events.empty():                
                     break
 
         if self.isSolved():
-            print("SOLVED IT!")
+            return SOLVED
+        return STUCK
+
+    #
+    # a deduction step is (rule, kind, cells, value):
+    #    (rule, "set", ((row, col),), val)          - the rule placed val
+    #    (rule, "remove", ((row, col), ...), val)   - the rule removed val from cells
+    # a rule that placed values only records the placements, the removals
+    # that come with them follow from the placements.
+    #
+    def traceRule(self, trace, rule, mark):
+        """
+        Appends the steps a rule made since the journal had mark entries.
+        
+        Args:
+            trace (list): The list of steps.
+            rule (str): The rule name.
+            mark (int): len(self.changes) before the rule ran.
+        
+        Returns:
+            int: The current len(self.changes), the mark for the next rule.
+        """
+        sets = []
+        removed = {}
+        for kind, element, val in self.changes[mark:]:
+            if kind == "final" and element.final:
+                sets.append((rule, "set", ((element.row, element.column),), next(iter(element.values))))
+            elif kind == "remove":
+                removed.setdefault(val, []).append((element.row, element.column))
+        if sets:
+            trace.extend(sets)
+        else:
+            for val, cells in removed.items():
+                trace.append((rule, "remove", tuple(cells), val))
+        return len(self.changes)
     
     def printCols(self):
         """
@@ -363,3 +940,37 @@ class Grid:
                         logger.error("Error parsing row %s: %s", row, e)
         except FileNotFoundError as e:
             logger.error("File not found: %s", e)
+
+    def load_string(self, puzzle):
+        """
+        Loads a Sudoku grid from an 81 character string, read row by row.
+        Digits 1-9 are givens, '0' or '.' are empty cells.
+        
+        Args:
+            puzzle (str): The puzzle string.
+        """
+        if not isinstance(puzzle, str) or len(puzzle) != 81:
+            logger.error("Invalid puzzle string: must be 81 characters")
+            return
+        for indx, char in enumerate(puzzle):
+            if char in "123456789":
+                self.setValue(indx // 9, indx % 9, int(char))
+            elif char not in "0.":
+                logger.error("Invalid character in puzzle string: %s", char)
+
+    def to_string(self):
+        """
+        Returns the grid as an 81 character string, with '.' for cells that
+        do not have a final value yet.
+        
+        Returns:
+            str: The puzzle string.
+        """
+        return_string = ""
+        for row in self.Rows:
+            for elem in row.elements:
+                if elem.final:
+                    return_string += str(next(iter(elem.values)))
+                else:
+                    return_string += "."
+        return return_string
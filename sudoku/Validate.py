@@ -0,0 +1,119 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#
+# Bulk validation of submitted solutions.
+#
+# Grids are checked N at a time as an (N, 81) array of digits. Each digit d
+# becomes the bit 1 << d, the bits of the 9 cells of every row, column and
+# sub-grid are ORed together, and a unit is good only if the OR is exactly
+# bits 1-9. Nine cells can only cover those nine bits if they hold 1-9 once
+# each, and an empty or out of range cell adds a bit outside them.
+#
+# The work is done on chunks of CHUNK grids transposed to (81, CHUNK), so
+# every OR runs over one contiguous vector per cell that stays in cache.
+#
+# Units are numbered rows 0-8, columns 9-17, sub-grids 18-26.
+#
+UNITS = ([[row * 9 + col for col in range(9)] for row in range(9)] +
+         [[row * 9 + col for row in range(9)] for col in range(9)] +
+         [[(sg // 3 * 3 + indx // 3) * 9 + sg % 3 * 3 + indx % 3 for indx in range(9)] for sg in range(9)])
+ALL_BITS = 0x3fe
+CHUNK = 8192
+# stands in for a string that is not 81 characters long
+BAD_GRID = "?" * 81
+
+def toArray(grids):
+    """
+    Converts grids to an (N, 81) uint8 array of digits, 0 for empty.
+
+    Args:
+        grids: An (N, 81) or (N, 9, 9) integer array, a list of 81 character
+            strings ('0' or '.' for empty), or a packed buffer of N * 81
+            bytes. Arrays and buffers may hold the digits 0-9 themselves or
+            those characters, grid by grid.
+
+    Returns:
+        numpy.ndarray: The digits. Anything that is not a digit comes out
+            above 9, so it fails validation, and so does every cell of a
+            string that is not 81 characters long.
+    """
+    strings = not isinstance(grids, (np.ndarray, bytes, bytearray, memoryview))
+    if isinstance(grids, np.ndarray):
+        raw = grids
+    elif not strings:
+        raw = np.frombuffer(grids, dtype=np.uint8)
+    else:
+        if isinstance(grids, str):
+            grids = [grids]
+        grids = list(grids)
+        # joined strings of the wrong length would shift every grid after them
+        lengths = np.fromiter(map(len, grids), dtype=np.int64, count=len(grids))
+        if (lengths != 81).any():
+            grids = [grid if len(grid) == 81 else BAD_GRID for grid in grids]
+        # a character that is not ASCII becomes '?', which fails only its grid
+        raw = np.frombuffer("".join(grids).encode("ascii", errors="replace"), dtype=np.uint8)
+    if raw.size % 81:
+        raise ValueError("grid data is not a whole number of 81 cell grids")
+    raw = raw.reshape(-1, 81)
+    if raw.dtype != np.uint8:
+        # clip in the source type, a plain cast would wrap 260 round to 4
+        raw = np.clip(raw, 0, 255).astype(np.uint8)
+    # strings are characters. otherwise a grid of characters has nothing
+    # below '.', and a grid of digits has a 0-9
+    chars = None if strings else raw.min(axis=1) >= ord(".")
+    if strings or chars.any():
+        digits = raw - np.uint8(ord("0"))
+        digits[raw == ord(".")] = 0
+        raw = digits if strings or chars.all() else np.where(chars[:, None], digits, raw)
+    return raw
+
+def validateBatch(grids, givens=None):
+    """
+    Checks N completed grids in a few array operations.
+
+    Args:
+        grids: The completed grids, in any form toArray() takes.
+        givens: Optional puzzles the grids must agree with, one per grid or a
+            single one for all of them, in any form toArray() takes.
+
+    Returns:
+        tuple: (valid, badUnits, badGivens). valid is an (N,) bool array,
+            badUnits an (N, 27) bool array of the units that are not 1-9,
+            and badGivens an (N,) bool array of grids that change a given.
+    """
+    digits = toArray(grids)
+    count = digits.shape[0]
+    givenDigits = None
+    if givens is not None:
+        givenDigits = toArray(givens)
+        if givenDigits.shape[0] not in (1, count):
+            raise ValueError("need one set of givens, or one per grid")
+    badUnits = np.empty((count, 27), dtype=bool)
+    badGivens = np.zeros(count, dtype=bool)
+    for start in range(0, count, CHUNK):
+        chunk = digits[start:start + CHUNK]
+        # anything from 15 up would shift out of 16 bits, 15 is just as wrong
+        cellBits = np.ascontiguousarray(np.left_shift(np.uint16(1), np.minimum(chunk, 15).T, dtype=np.uint16))
+        unitBits = np.empty((27, chunk.shape[0]), dtype=np.uint16)
+        for unit, cells in enumerate(UNITS):
+            bits = unitBits[unit]
+            np.bitwise_or(cellBits[cells[0]], cellBits[cells[1]], out=bits)
+            for cell in cells[2:]:
+                bits |= cellBits[cell]
+        badUnits[start:start + CHUNK] = (unitBits != ALL_BITS).T
+        if givenDigits is None:
+            continue
+        if givenDigits.shape[0] == 1:
+            # one puzzle for all of them, only its given cells need looking at
+            bad = badGivens[start:start + CHUNK]
+            for cell in np.flatnonzero(givenDigits[0]):
+                bad |= cellBits[cell] != (1 << int(givenDigits[0, cell]))
+        else:
+            givenChunk = givenDigits[start:start + CHUNK]
+            badGivens[start:start + CHUNK] = ((givenChunk != 0) & (givenChunk != chunk)).any(axis=1)
+    valid = ~badUnits.any(axis=1) & ~badGivens
+    logger.debug("validateBatch: %s of %s grids valid", int(valid.sum()), count)
+    return valid, badUnits, badGivens
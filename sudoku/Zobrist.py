@@ -0,0 +1,53 @@
+import random
+
+#
+# Zobrist hashing of the grid's candidate state.
+#
+# Every (cell, value) pair gets a fixed random 64 bit key. The hash of a
+# state is the XOR of the keys of all values still possible, so removing or
+# adding back one value is a single XOR. The keys come from a fixed seed, so
+# every process (and every worker of a ParallelSearch) agrees on them. Final
+# flags are not hashed: which values are left decides the rest of the solve.
+# Grids only keep a hash when built with Grid(hashing=True).
+#
+def makeKeys(seed):
+    """
+    Makes the key table.
+
+    Args:
+        seed (int): The random seed.
+
+    Returns:
+        tuple: KEYS[row * 9 + col][val], with val 0 unused.
+    """
+    rng = random.Random(seed)
+    return tuple(tuple(rng.getrandbits(64) if val else 0 for val in range(10)) for cell in range(81))
+
+KEYS = makeKeys(1729)
+
+class ZobristHash:
+    """
+    The running hash of one grid, updated by its elements as values change.
+    """
+    def __init__(self):
+        """
+        Initializes the hash for an empty grid, every value possible everywhere.
+        """
+        self.value = 0
+        for keys in KEYS:
+            for key in keys:
+                self.value ^= key
+
+    def recompute(self, grid):
+        """
+        Recomputes the hash from scratch, for when values were replaced wholesale.
+
+        Args:
+            grid (Grid): The grid this hash belongs to.
+        """
+        self.value = 0
+        for row in grid.Rows:
+            for element in row.elements:
+                keys = KEYS[element.row * 9 + element.column]
+                for val in element.values:
+                    self.value ^= keys[val]
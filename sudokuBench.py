@@ -0,0 +1,41 @@
+import click
+import glob
+import os
+import sys
+import time
+import logging
+from sudoku import Batch
+
+#
+# Compares the thread pool against the process pool for batch solving.
+# Run it under a free-threaded build (python3.13t) to see real thread
+# parallelism, and under a normal build to see the GIL bound case.
+#
+
+def loadPuzzles(puzzleFile):
+    if puzzleFile:
+        with open(puzzleFile) as file:
+            return [line.strip() for line in file if len(line.strip()) == 81]
+    testDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+    return [Batch.csvToPuzzle(path) for path in sorted(glob.glob(os.path.join(testDir, "test*.csv")))]
+
+@click.command()
+@click.option("--puzzles", "puzzleFile", default=None, help="File with one 81 character puzzle per line. Defaults to the test CSVs.")
+@click.option("--repeat", default=50, help="How many times to repeat the puzzle list.")
+@click.option("--workers", default=os.cpu_count() or 1, help="Pool size.")
+def bench(puzzleFile, repeat, workers):
+    puzzles = loadPuzzles(puzzleFile) * repeat
+    gilCheck = getattr(sys, "_is_gil_enabled", None)
+    gil = "enabled" if gilCheck is None or gilCheck() else "disabled"
+    print(f"python {sys.version.split()[0]}, GIL {gil}, {len(puzzles)} puzzles, {workers} workers")
+    for executor in ["thread", "process"]:
+        start = time.perf_counter()
+        results = Batch.solveBatch(puzzles, workers=workers, executor=executor)
+        elapsed = time.perf_counter() - start
+        print(f"{executor:>8}: {elapsed:8.3f}s  {len(results) / elapsed:10.1f} puzzles/s")
+
+logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s',
+                    level=logging.WARNING)
+
+if __name__ == '__main__':
+    bench()
@@ -1,8 +1,13 @@
 import click
 from sudoku import SudokuV1
+from sudoku import SolveLimits
 import csv
 import logging
 
+#
+# the grid being worked on is passed in as the click context object,
+# so nothing about a solve lives at module level.
+#
 @click.group(invoke_without_command=True)
 @click.option("--command", prompt=">")
 @click.pass_context
@@ -26,6 +31,9 @@ reduces the possible values. Hopefully, after all initial values are set the sol
 
 valid commands:
 \tset - Set a value.
+\tunset - Remove a value that was set.
+\tundo - Undo the last set or unset.
+\tredo - Redo the last undone set or unset.
 \tp - Print out the current state of the grid.
 \t    Each cell, or element in the grid displays the remaining possible values.
 \t    If only one value is left AND it looks like *V* in the center of the grid,
@@ -38,15 +46,36 @@ valid commands:
 """
             
 @cli.command(name='set')
-def command1():
+@click.pass_obj
+def command1(myGrid):
     row = click.prompt('row', type=click.IntRange(1,9)) - 1
     col = click.prompt('col', type=click.IntRange(1,9)) - 1
     val = click.prompt('val', type=click.IntRange(1,9))
     click.echo("got " + str(row) + "," + str(col) + " value: " + str(val))
-    myGrid.setValue(row, col, val)
+    myGrid.enterValue(row, col, val)
+
+@cli.command(name='unset')
+@click.pass_obj
+def unsetValue(myGrid):
+    row = click.prompt('row', type=click.IntRange(1,9)) - 1
+    col = click.prompt('col', type=click.IntRange(1,9)) - 1
+    myGrid.unset(row, col)
+
+@cli.command(name='undo')
+@click.pass_obj
+def undoEdit(myGrid):
+    if not myGrid.undo():
+        print("nothing to undo")
+
+@cli.command(name='redo')
+@click.pass_obj
+def redoEdit(myGrid):
+    if not myGrid.redo():
+        print("nothing to redo")
 
 @cli.command(name='f')
-def readFile():
+@click.pass_obj
+def readFile(myGrid):
     inputFile = click.prompt('input', type=click.STRING)
     logger.debug('input file is %s', str(inputFile))
     with open (inputFile, newline='') as csvFile:
@@ -56,11 +85,14 @@ def readFile():
             myGrid.setValue(int(row[0]) - 1, int(row[1]) - 1, int(row[2]))
 
 @cli.command(name='e')
-def evaluateGrid():
-    myGrid.evaluate()
+@click.pass_obj
+def evaluateGrid(myGrid):
+    if myGrid.evaluate() == SolveLimits.SOLVED:
+        print("SOLVED IT!")
 
 @cli.command(name='p')
-def gridPrint():
+@click.pass_obj
+def gridPrint(myGrid):
     print(myGrid.pretty_print())
 
 @cli.command(name='q')
@@ -77,9 +109,10 @@ def setDebug():
     logger.setLevel(logging.DEBUG)
 
 def main():
+    myGrid = SudokuV1.Grid()
     while True:
         try:
-            cli.main(standalone_mode=False)
+            cli.main(standalone_mode=False, obj=myGrid)
         except click.exceptions.Abort:
             break
 
@@ -88,8 +121,6 @@ logging.basicConfig(filename='SudokuSolver.log',
                     filemode='w',
                     level=logging.INFO)
 logger = logging.getLogger(__name__)
-
-myGrid = SudokuV1.Grid()
                                     
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import os
+import csv
+from sudoku import Batch
+
+#
+# puzzles and helpers shared by the tests
+#
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# the rules alone solve it
+EASY_PUZZLE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+EASY_SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+
+# needs guesses, and has exactly one solution
+HARD_PUZZLE = "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5...."
+HARD_SOLUTION = "487312695593684271126597384735849162914265837268731549851476923379128456642953718"
+
+def loadTestGrid(grid, name):
+    with open(os.path.join(TEST_DIR, name), newline='') as csvFile:
+        for row in csv.reader(csvFile):
+            grid.setValue(int(row[0]) - 1, int(row[1]) - 1, int(row[2]))
+
+def loadTestPuzzle(name):
+    return Batch.csvToPuzzle(os.path.join(TEST_DIR, name))
+
+def isValidSolution(solution):
+    rows = [solution[row * 9:row * 9 + 9] for row in range(9)]
+    cols = [solution[col::9] for col in range(9)]
+    subGrids = ["".join(rows[row][col:col + 3] for row in range(sg // 3 * 3, sg // 3 * 3 + 3))
+                for sg in range(9) for col in [sg % 3 * 3]]
+    return all(sorted(unit) == list("123456789") for unit in rows + cols + subGrids)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import threading
+import unittest
+import logging
+from sudoku import Batch
+from sudoku import SolveLimits
+from sudoku import ResultStore
+from tests.puzzles import HARD_PUZZLE, HARD_SOLUTION, loadTestPuzzle
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.puzzles = [loadTestPuzzle("testSingleValueRule.csv"), loadTestPuzzle("testExpert1.csv")] * 4
+
+    def test_solve_puzzle(self):
+        puzzle, solution, status, seconds, events = Batch.solvePuzzle(self.puzzles[1])
+        self.assertEqual(puzzle, self.puzzles[1])
+        self.assertEqual(status, SolveLimits.SOLVED)
+        self.assertNotIn(".", solution)
+        self.assertGreater(events, 0)
+
+    def test_thread_batch(self):
+        results = Batch.solveBatch(self.puzzles, workers=4, executor="thread")
+        self.assertEqual([result[0] for result in results], self.puzzles)
+        self.assertTrue(all(result[2] == SolveLimits.SOLVED for result in results))
+        self.assertEqual(results[1][1], results[3][1])
+
+    def test_thread_matches_process(self):
+        threads = Batch.solveBatch(self.puzzles[:2], workers=2, executor="thread")
+        processes = Batch.solveBatch(self.puzzles[:2], workers=2, executor="process")
+        self.assertEqual([result[:3] for result in threads], [result[:3] for result in processes])
+
+    def test_batch_cancelled(self):
+        token = threading.Event()
+        token.set()
+        results = Batch.solveBatch(self.puzzles, workers=2, cancelToken=token)
+        self.assertTrue(all(result[2] == SolveLimits.CANCELLED for result in results))
+
+    def test_batch_with_store(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "results.sqlite")
+            with ResultStore.ResultStore(path) as store:
+                first = Batch.solveBatch(self.puzzles, workers=2, store=store)
+                self.assertEqual(store.count(), 2)
+            with ResultStore.ResultStore(path) as store:
+                token = threading.Event()
+                token.set()
+                # everything comes from the store, so nothing is cancelled
+                second = Batch.solveBatch(self.puzzles, workers=2, cancelToken=token, store=store)
+        self.assertEqual([result[:3] for result in first], [result[:3] for result in second])
+        self.assertTrue(all(result[2] == SolveLimits.SOLVED for result in second))
+
+    def test_search_results_stored(self):
+        # the rules alone get stuck on it, the answer still has to be stored
+        with tempfile.TemporaryDirectory() as tempDir:
+            with ResultStore.ResultStore(os.path.join(tempDir, "results.sqlite")) as store:
+                results = Batch.solveBatch([HARD_PUZZLE], workers=1, store=store)
+                self.assertEqual(results[0][1:3], (HARD_SOLUTION, SolveLimits.SOLVED))
+                self.assertEqual(store.get(HARD_PUZZLE)[:2], (HARD_SOLUTION, SolveLimits.SOLVED))
+
+    def test_unknown_executor(self):
+        self.assertEqual(Batch.solveBatch(self.puzzles, executor="fibers"), [])
+
+if __name__ == '__main__':
+    unittest.main()
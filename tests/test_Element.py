@@ -45,5 +45,20 @@ class TestElement(unittest.TestCase):
         self.assertEqual(self.element.printThird(2), "    ")
         self.assertEqual(self.element.printThird(3), "    ")
 
+    def test_add_value(self):
+        self.element.remove(5)
+        self.element.add(5)
+        self.assertEqual(list(self.element.values), list(range(1, 10)))
+
+    def test_changes_journal(self):
+        changes = []
+        element = Element(0, 0, queue.Queue(), changes)
+        element.remove(5)
+        element.add(5)
+        element.set(3)
+        self.assertEqual(changes[0], ("remove", element, 5))
+        self.assertEqual(changes[1], ("add", element, 5))
+        self.assertEqual(len(changes), 10)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+import logging
+from sudoku import Hints
+from sudoku import SolveLimits
+from sudoku import ResultStore
+from tests.puzzles import EASY_PUZZLE, EASY_SOLUTION, HARD_PUZZLE, HARD_SOLUTION
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+def play(state, hint):
+    row, col = hint[2][0]
+    indx = row * 9 + col
+    return state[:indx] + str(hint[3]) + state[indx + 1:]
+
+class TestHints(unittest.TestCase):
+
+    def test_record_path(self):
+        path = Hints.recordPath(EASY_PUZZLE)
+        self.assertEqual(path.status, SolveLimits.SOLVED)
+        self.assertEqual(path.solution, EASY_SOLUTION)
+        self.assertEqual(sum(1 for step in path.steps if step[1] == "set"), EASY_PUZZLE.count("0"))
+
+    def test_hints_solve_the_puzzle(self):
+        for puzzle, solution in ((EASY_PUZZLE, EASY_SOLUTION), (HARD_PUZZLE, HARD_SOLUTION)):
+            cache = Hints.HintCache()
+            state = puzzle
+            hint = cache.nextHint(puzzle, state)
+            while hint is not None:
+                self.assertEqual(hint[1], "set")
+                row, col = hint[2][0]
+                self.assertEqual(str(hint[3]), solution[row * 9 + col])
+                state = play(state, hint)
+                hint = cache.nextHint(puzzle, state)
+            self.assertEqual(state, solution)
+            self.assertEqual(cache.misses, 1)
+
+    def test_search_steps(self):
+        path = Hints.recordPath(HARD_PUZZLE)
+        self.assertEqual(path.solution, HARD_SOLUTION)
+        self.assertIn("search", [step[0] for step in path.steps])
+
+    def test_hint_skips_filled_cells(self):
+        path = Hints.recordPath(EASY_PUZZLE)
+        first = path.nextHint(EASY_PUZZLE)
+        # the player fills in a cell further down the path themselves
+        later = [step for step in path.steps if step[1] == "set"][-1]
+        hint = path.nextHint(play(EASY_PUZZLE, later))
+        self.assertEqual(hint, first)
+        hint = path.nextHint(play(EASY_PUZZLE, first))
+        self.assertNotEqual(hint[2], first[2])
+
+    def test_mistake(self):
+        path = Hints.recordPath(EASY_PUZZLE)
+        indx = EASY_PUZZLE.index("0")
+        wrong = "1" if EASY_SOLUTION[indx] != "1" else "2"
+        hint = path.nextHint(EASY_PUZZLE[:indx] + wrong + EASY_PUZZLE[indx + 1:])
+        self.assertEqual(hint, ("mistake", "set", ((indx // 9, indx % 9),), int(EASY_SOLUTION[indx])))
+
+    def test_mistake_multiple_solutions(self):
+        # without the 6 at 0, 6 the puzzle has more than one solution
+        puzzle = EASY_PUZZLE[:6] + "0" + EASY_PUZZLE[7:]
+        path = Hints.recordPath(puzzle)
+        self.assertEqual(path.status, SolveLimits.MULTIPLE_SOLUTIONS)
+        self.assertIsNone(path.solution)
+        rule, kind, cells, value = next(step for step in path.steps if step[1] == "set")
+        row, col = cells[0]
+        indx = row * 9 + col
+        wrong = "1" if value != 1 else "2"
+        hint = path.nextHint(puzzle[:indx] + wrong + puzzle[indx + 1:])
+        self.assertEqual(hint, ("mistake", "set", ((row, col),), value))
+
+    def test_cache(self):
+        cache = Hints.HintCache(maxPaths=1)
+        path = cache.path(EASY_PUZZLE)
+        self.assertIs(cache.path(EASY_PUZZLE.replace("0", ".")), path)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.path(HARD_PUZZLE)
+        self.assertEqual(len(cache.paths), 1)
+        self.assertIsNot(cache.path(EASY_PUZZLE), path)
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            with ResultStore.ResultStore(os.path.join(tempDir, "results.sqlite")) as store:
+                searched = Hints.recordPath(HARD_PUZZLE, store=store)
+                self.assertEqual(store.get(HARD_PUZZLE)[:2], (HARD_SOLUTION, SolveLimits.SOLVED))
+                # no search this time, a branch budget of 0 would stop one
+                limits = SolveLimits.SolveLimits(maxBranches=0)
+                cached = Hints.HintCache(store=store).path(HARD_PUZZLE, limits)
+        self.assertEqual(limits.branches, 0)
+        self.assertEqual(cached.status, SolveLimits.SOLVED)
+        self.assertEqual(cached.steps, searched.steps)
+
+    def test_limited_path_not_kept(self):
+        cache = Hints.HintCache()
+        path = cache.path(HARD_PUZZLE, SolveLimits.SolveLimits(maxEvents=5))
+        self.assertEqual(path.status, SolveLimits.EVENT_BUDGET)
+        self.assertEqual(len(cache.paths), 0)
+
+    def test_limited_retries_get_further(self):
+        cache = Hints.HintCache()
+        path = cache.path(HARD_PUZZLE, SolveLimits.SolveLimits(maxBranches=20))
+        self.assertEqual(path.status, SolveLimits.BRANCH_BUDGET)
+        self.assertEqual(len(cache.deadStates), 1)
+        for _ in range(10):
+            path = cache.path(HARD_PUZZLE, SolveLimits.SolveLimits(maxBranches=20))
+            if path.status == SolveLimits.SOLVED:
+                break
+        self.assertEqual(path.solution, HARD_SOLUTION)
+        self.assertEqual(len(cache.deadStates), 0)
+        self.assertEqual(len(cache.paths), 1)
+
+if __name__ == '__main__':
+    unittest.main()
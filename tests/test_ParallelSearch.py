@@ -0,0 +1,63 @@
+import threading
+import unittest
+import logging
+from sudoku import SudokuV1
+from sudoku import ParallelSearch
+from sudoku import SolveLimits
+from tests.puzzles import HARD_PUZZLE, HARD_SOLUTION, isValidSolution
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestParallelSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SudokuV1.Grid()
+
+    def test_split(self):
+        self.grid.load_string("1" + "." * 80)
+        self.grid.evaluate()
+        search = ParallelSearch.ParallelSearch(self.grid, workers=2)
+        tasks = search.split(maxSolutions=2)
+        self.assertGreaterEqual(len(tasks), 8)
+        self.assertTrue(all(len(state) == 81 for state in tasks))
+        self.assertEqual(len(set(tasks)), len(tasks))
+
+    def test_solve_unique(self):
+        self.grid.load_string(HARD_PUZZLE)
+        search = ParallelSearch.ParallelSearch(self.grid, workers=2)
+        self.assertEqual(search.solve(maxSolutions=2), SolveLimits.SOLVED)
+        self.assertTrue(self.grid.isSolved())
+        self.assertTrue(isValidSolution(self.grid.to_string()))
+
+    def test_multiple_solutions(self):
+        self.grid.load_string("1" + "." * 80)
+        search = ParallelSearch.ParallelSearch(self.grid, workers=2)
+        self.assertEqual(search.solve(maxSolutions=2), SolveLimits.MULTIPLE_SOLUTIONS)
+        self.assertEqual(len(search.solutions), 2)
+        self.assertNotEqual(search.solutions[0], search.solutions[1])
+        self.assertFalse(self.grid.isSolved())
+
+    def test_keeps_undo_history(self):
+        self.grid.load_string(HARD_PUZZLE)
+        loaded = self.grid.snapshot()
+        self.grid.enterValue(0, 2, int(HARD_SOLUTION[2]))
+        search = ParallelSearch.ParallelSearch(self.grid, workers=2)
+        self.assertEqual(search.solve(), SolveLimits.SOLVED)
+        self.assertEqual(self.grid.to_string(), HARD_SOLUTION)
+        self.assertEqual(len(self.grid.history), 1)
+        self.assertTrue(self.grid.undo())
+        self.assertEqual(self.grid.snapshot(), loaded)
+
+    def test_cancelled(self):
+        self.grid.load_string(HARD_PUZZLE)
+        token = threading.Event()
+        token.set()
+        search = ParallelSearch.ParallelSearch(self.grid, workers=2, limits=SolveLimits.SolveLimits(cancelToken=token))
+        self.assertEqual(search.solve(), SolveLimits.CANCELLED)
+        self.assertTrue(self.grid.isConsistent())
+
+if __name__ == '__main__':
+    unittest.main()
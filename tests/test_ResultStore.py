@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import logging
+from sudoku import ResultStore
+from sudoku import SolveLimits
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+PUZZLE = "1" + "." * 80
+SOLUTION = "123456789" * 9
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "results.sqlite")
+        self.store = ResultStore.ResultStore(self.path, batchSize=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tempDir.cleanup()
+
+    def test_puzzle_key(self):
+        self.assertEqual(ResultStore.puzzleKey("10" + "." * 79), "1." + "." * 79)
+
+    def test_put_get(self):
+        self.assertIsNone(self.store.get(PUZZLE))
+        self.store.put(PUZZLE, SOLUTION, SolveLimits.SOLVED, 0.5, 42)
+        self.assertEqual(self.store.get(PUZZLE), (SOLUTION, SolveLimits.SOLVED, 0.5, 42))
+        self.assertEqual(self.store.get(PUZZLE.replace(".", "0")), (SOLUTION, SolveLimits.SOLVED, 0.5, 42))
+
+    def test_not_final_ignored(self):
+        self.store.put(PUZZLE, SOLUTION, SolveLimits.TIMEOUT)
+        self.store.put(PUZZLE, SOLUTION, SolveLimits.STUCK)
+        self.assertIsNone(self.store.get(PUZZLE))
+
+    def test_batched_writes(self):
+        reader = ResultStore.ResultStore(self.path)
+        self.store.put(PUZZLE, SOLUTION, SolveLimits.SOLVED)
+        # still buffered, other readers do not see it yet
+        self.assertIsNone(reader.get(PUZZLE))
+        self.store.put("2" + "." * 80, SOLUTION, SolveLimits.MULTIPLE_SOLUTIONS)
+        self.assertEqual(reader.get(PUZZLE)[1], SolveLimits.SOLVED)
+        reader.close()
+
+    def test_persists(self):
+        self.store.put(PUZZLE, SOLUTION, SolveLimits.SOLVED)
+        self.store.close()
+        self.store = ResultStore.ResultStore(self.path)
+        self.assertEqual(self.store.get(PUZZLE)[0], SOLUTION)
+        self.assertEqual(self.store.count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
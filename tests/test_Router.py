@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import logging
+from sudoku import SudokuV1
+from sudoku import Router
+from sudoku import SolveLimits
+from sudoku import ResultStore
+from tests.puzzles import HARD_PUZZLE, HARD_SOLUTION, loadTestPuzzle
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.classifier = Router.Classifier()
+
+    def test_features(self):
+        grid = SudokuV1.Grid()
+        grid.load_string("12345678" + "." * 73)
+        features = self.classifier.features(grid)
+        self.assertEqual(features["clues"], 8)
+        self.assertEqual(features["open"], 73)
+        self.assertEqual(features["singles"], 1)
+
+    def test_classify(self):
+        easy = SudokuV1.Grid()
+        easy.load_string(loadTestPuzzle("testSingleValueRule.csv"))
+        self.assertEqual(self.classifier.classify(self.classifier.features(easy)), Router.PROPAGATE)
+        hard = SudokuV1.Grid()
+        hard.load_string(HARD_PUZZLE)
+        self.assertEqual(self.classifier.classify(self.classifier.features(hard)), Router.SEARCH)
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router.Router(maxRecords=2)
+
+    def test_propagate_route(self):
+        grid, record = self.router.solve(loadTestPuzzle("testSingleValueRule.csv"))
+        self.assertEqual(record.route, Router.PROPAGATE)
+        self.assertFalse(record.fallback)
+        self.assertEqual(record.status, SolveLimits.SOLVED)
+        self.assertTrue(grid.isSolved())
+        self.assertGreater(record.events, 0)
+        self.assertEqual(record.branches, 0)
+
+    def test_search_route(self):
+        grid, record = self.router.solve(HARD_PUZZLE)
+        self.assertEqual(record.route, Router.SEARCH)
+        self.assertEqual(record.status, SolveLimits.SOLVED)
+        self.assertTrue(grid.isSolved())
+        self.assertGreater(record.branches, 0)
+
+    def test_fallback(self):
+        router = Router.Router(Router.Classifier(minClues=0))
+        grid, record = router.solve(HARD_PUZZLE)
+        self.assertEqual(record.route, Router.PROPAGATE)
+        self.assertTrue(record.fallback)
+        self.assertEqual(record.status, SolveLimits.SOLVED)
+
+    def test_routes_differ_in_cost(self):
+        grid, searched = self.router.solve(HARD_PUZZLE)
+        self.assertFalse(any(grid.rules[name] for name in Router.SEARCH_RULES_OFF))
+        grid, fellBack = Router.Router(Router.Classifier(minClues=0)).solve(HARD_PUZZLE)
+        self.assertTrue(fellBack.fallback)
+        self.assertTrue(all(grid.rules.values()))
+        self.assertEqual(searched.status, fellBack.status)
+        self.assertLess(searched.events, fellBack.events)
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            with ResultStore.ResultStore(os.path.join(tempDir, "results.sqlite")) as store:
+                router = Router.Router(store=store)
+                router.solve(HARD_PUZZLE)
+                grid, record = router.solve(HARD_PUZZLE)
+        self.assertEqual(record.route, Router.STORED)
+        self.assertEqual(record.status, SolveLimits.SOLVED)
+        self.assertEqual(record.branches, 0)
+        self.assertEqual(grid.to_string(), HARD_SOLUTION)
+
+    def test_records_bounded(self):
+        for _ in range(3):
+            self.router.solve(loadTestPuzzle("testSingleValueRule.csv"))
+        self.assertEqual(len(self.router.records), 2)
+
+if __name__ == '__main__':
+    unittest.main()
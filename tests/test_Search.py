@@ -0,0 +1,92 @@
+import unittest
+import logging
+from sudoku import SudokuV1
+from sudoku import Search
+from sudoku import SolveLimits
+from tests.puzzles import HARD_PUZZLE, loadTestGrid, isValidSolution
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestBacktrackingSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SudokuV1.Grid()
+
+    def test_rules_alone_get_stuck(self):
+        loadTestGrid(self.grid, "testMaster1.csv")
+        self.assertEqual(self.grid.evaluate(), SolveLimits.STUCK)
+
+    def test_solve(self):
+        loadTestGrid(self.grid, "testMaster1.csv")
+        givens = self.grid.to_string()
+        search = Search.BacktrackingSearch(self.grid)
+        self.assertEqual(search.solve(), SolveLimits.SOLVED)
+        solution = self.grid.to_string()
+        self.assertTrue(isValidSolution(solution))
+        self.assertTrue(all(given in (".", cell) for given, cell in zip(givens, solution)))
+        self.assertEqual(search.solutions, [solution])
+
+    def test_unique_solution(self):
+        self.grid.load_string(HARD_PUZZLE)
+        self.assertEqual(self.grid.evaluate(), SolveLimits.STUCK)
+        search = Search.BacktrackingSearch(self.grid)
+        self.assertEqual(search.solve(maxSolutions=2), SolveLimits.SOLVED)
+        self.assertTrue(isValidSolution(self.grid.to_string()))
+
+    def test_multiple_solutions(self):
+        self.grid.load_string("1" + "." * 80)
+        search = Search.BacktrackingSearch(self.grid)
+        self.assertEqual(search.solve(maxSolutions=2), SolveLimits.MULTIPLE_SOLUTIONS)
+        self.assertEqual(len(search.solutions), 2)
+        self.assertFalse(self.grid.isSolved())
+
+    def test_no_solution(self):
+        # 1-8 in the first row leaves 9 for 0,8, but 9 is already in column 8
+        self.grid.load_string("12345678." + "........9" + "." * 63)
+        self.grid.Rows[0].elements[8].values = {9: ""}
+        self.grid.Rows[1].elements[8].final = True
+        search = Search.BacktrackingSearch(self.grid)
+        self.assertEqual(search.solve(), SolveLimits.NO_SOLUTION)
+
+    def test_branch_budget(self):
+        loadTestGrid(self.grid, "testMaster1.csv")
+        limits = SolveLimits.SolveLimits(maxBranches=0)
+        search = Search.BacktrackingSearch(self.grid, limits)
+        self.assertEqual(search.solve(), SolveLimits.BRANCH_BUDGET)
+        self.assertTrue(self.grid.isConsistent())
+        self.assertFalse(self.grid.isSolved())
+
+    def test_no_dead_states_without_hashing(self):
+        self.grid.load_string(HARD_PUZZLE)
+        search = Search.BacktrackingSearch(self.grid)
+        self.assertEqual(search.solve(maxSolutions=2), SolveLimits.SOLVED)
+        self.assertEqual(len(search.deadStates), 0)
+
+    def test_dead_states_reused(self):
+        self.grid = SudokuV1.Grid(hashing=True)
+        self.grid.load_string(HARD_PUZZLE)
+        first = Search.BacktrackingSearch(self.grid, SolveLimits.SolveLimits())
+        first.solve(maxSolutions=2)
+        self.assertGreater(len(first.deadStates), 0)
+        grid = SudokuV1.Grid(hashing=True)
+        grid.load_string(HARD_PUZZLE)
+        limits = SolveLimits.SolveLimits()
+        second = Search.BacktrackingSearch(grid, limits, deadStates=first.deadStates)
+        self.assertEqual(second.solve(maxSolutions=2), SolveLimits.SOLVED)
+        self.assertEqual(grid.to_string(), self.grid.to_string())
+        self.assertGreater(second.deadHits, 0)
+        self.assertLess(limits.branches, first.limits.branches)
+
+    def test_dead_states_bounded(self):
+        search = Search.BacktrackingSearch(self.grid, maxDeadStates=2)
+        for stateHash in range(3):
+            search.markDead(stateHash)
+        self.assertFalse(search.isDead(0))
+        self.assertTrue(search.isDead(2))
+        self.assertEqual(search.deadHits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import threading
+import unittest
+import logging
+from sudoku import SolveLimits
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestSolveLimits(unittest.TestCase):
+
+    def test_no_limits(self):
+        limits = SolveLimits.SolveLimits()
+        for _ in range(1000):
+            self.assertIsNone(limits.countEvent())
+            self.assertIsNone(limits.countBranch())
+
+    def test_event_budget(self):
+        limits = SolveLimits.SolveLimits(maxEvents=2)
+        self.assertIsNone(limits.countEvent())
+        # the second event was allowed, and spends the budget
+        self.assertEqual(limits.countEvent(), SolveLimits.EVENT_BUDGET)
+
+    def test_branch_budget(self):
+        limits = SolveLimits.SolveLimits(maxBranches=1)
+        self.assertIsNone(limits.countBranch())
+        self.assertEqual(limits.countBranch(), SolveLimits.BRANCH_BUDGET)
+
+    def test_timeout(self):
+        limits = SolveLimits.SolveLimits(timeout=0)
+        self.assertEqual(limits.check(), SolveLimits.TIMEOUT)
+
+    def test_cancel_sticks(self):
+        token = threading.Event()
+        limits = SolveLimits.SolveLimits(cancelToken=token)
+        self.assertIsNone(limits.check())
+        token.set()
+        self.assertEqual(limits.check(), SolveLimits.CANCELLED)
+        token.clear()
+        self.assertEqual(limits.check(), SolveLimits.CANCELLED)
+
+    def test_cancel_poll_every(self):
+        token = threading.Event()
+        token.set()
+        limits = SolveLimits.SolveLimits(cancelToken=token, pollEvery=3)
+        self.assertIsNone(limits.check())
+        self.assertIsNone(limits.check())
+        self.assertEqual(limits.check(), SolveLimits.CANCELLED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
 import logging
-import os
+import threading
 from sudoku import SudokuV1
+from sudoku import SolveLimits
+from tests.puzzles import EASY_PUZZLE, EASY_SOLUTION, loadTestGrid
 
 logging.basicConfig(filename='SudokuSolver.log',
                     format='%(asctime)s %(message)s',
@@ -33,5 +35,259 @@ class TestGrid(unittest.TestCase):
         self.grid.evaluate()
         self.assertTrue(self.grid.isSolved())
 
+    def test_evaluate_status(self):
+        loadTestGrid(self.grid, "testExpert1.csv")
+        self.assertEqual(self.grid.evaluate(), SolveLimits.SOLVED)
+
+    def test_evaluate_event_budget(self):
+        loadTestGrid(self.grid, "testExpert1.csv")
+        limits = SolveLimits.SolveLimits(maxEvents=10)
+        self.assertEqual(self.grid.evaluate(limits), SolveLimits.EVENT_BUDGET)
+        self.assertEqual(limits.events, 10)
+        self.assertFalse(self.grid.isSolved())
+        # the partial result can be resumed
+        self.assertEqual(self.grid.evaluate(), SolveLimits.SOLVED)
+
+    def test_evaluate_cancelled(self):
+        loadTestGrid(self.grid, "testExpert1.csv")
+        token = threading.Event()
+        token.set()
+        limits = SolveLimits.SolveLimits(cancelToken=token)
+        before = self.grid.to_string()
+        self.assertEqual(self.grid.evaluate(limits), SolveLimits.CANCELLED)
+        self.assertEqual(limits.events, 0)
+        self.assertEqual(self.grid.to_string(), before)
+
+    def test_evaluate_timeout(self):
+        loadTestGrid(self.grid, "testExpert1.csv")
+        limits = SolveLimits.SolveLimits(timeout=0)
+        self.assertEqual(self.grid.evaluate(limits), SolveLimits.TIMEOUT)
+        self.assertEqual(limits.events, 0)
+
+    def test_load_and_to_string(self):
+        puzzle = "5" + "." * 79 + "9"
+        self.grid.load_string(puzzle)
+        self.assertTrue(self.grid.Rows[0].elements[0].isFinalValue(5))
+        self.assertEqual(self.grid.to_string(), puzzle)
+
+    def removeExcept(self, row, val, keepCols):
+        for col in range(9):
+            if col not in keepCols:
+                self.grid.Rows[row].elements[col].remove(val)
+
+    def test_digit_masks(self):
+        self.removeExcept(1, 5, (2, 7))
+        rowMasks, colMasks = self.grid.digitMasks()
+        self.assertEqual(rowMasks[5][1], (1 << 2) | (1 << 7))
+        self.assertEqual(colMasks[5][2], 0x1ff)
+        self.grid.setValue(0, 0, 5)
+        rowMasks, colMasks = self.grid.digitMasks()
+        self.assertEqual(rowMasks[5][0], 0)
+
+    def test_x_wing(self):
+        self.removeExcept(1, 5, (2, 7))
+        self.removeExcept(4, 5, (2, 7))
+        self.grid.fishRule(2)
+        for row in range(9):
+            for col in (2, 7):
+                self.assertEqual(self.grid.Rows[row].elements[col].member(5), row in (1, 4))
+        self.assertTrue(self.grid.Rows[0].elements[0].member(5))
+
+    def test_swordfish_columns(self):
+        for col, keepRows in ((0, (1, 4)), (3, (4, 8)), (6, (1, 8))):
+            for row in range(9):
+                if row not in keepRows:
+                    self.grid.Cols[col].elements[row].remove(3)
+        self.grid.fishRule(3)
+        for row in (1, 4, 8):
+            for col in range(9):
+                if col not in (0, 3, 6):
+                    self.assertFalse(self.grid.Rows[row].elements[col].member(3))
+        self.assertTrue(self.grid.Rows[8].elements[6].member(3))
+        self.assertTrue(self.grid.Rows[0].elements[1].member(3))
+
+    def test_fish_rules_switchable(self):
+        self.removeExcept(1, 5, (2, 7))
+        self.removeExcept(4, 5, (2, 7))
+        for name in self.grid.rules:
+            self.grid.rules[name] = False
+        self.grid.setValue(8, 8, 1)
+        self.grid.evaluate()
+        self.assertTrue(self.grid.Rows[0].elements[2].member(5))
+        self.grid.rules["xWing"] = True
+        self.grid.evaluate()
+        self.assertFalse(self.grid.Rows[0].elements[2].member(5))
+
+    def test_set_value_not_possible(self):
+        self.grid.Rows[0].elements[0].remove(5)
+        self.grid.setValue(0, 0, 5)
+        self.assertFalse(self.grid.Rows[0].elements[0].final)
+
+    def test_is_consistent(self):
+        self.grid.setValue(0, 0, 5)
+        self.assertTrue(self.grid.isConsistent())
+        for col in range(1, 9):
+            self.grid.Rows[1].elements[col].remove(7)
+        self.grid.Rows[1].elements[0].remove(7)
+        self.assertFalse(self.grid.isConsistent())
+
+    def test_mrv_cell(self):
+        self.assertEqual(self.grid.mrvCell(), (0, 0))
+        self.grid.load_string("1234567" + "." * 74)
+        self.assertEqual(self.grid.mrvCell(), (0, 7))
+
+    def test_snapshot_restore(self):
+        self.grid.setValue(0, 0, 5)
+        state = self.grid.snapshot()
+        self.assertEqual(len(state), 81)
+        self.assertEqual(state[0], 512 | (1 << 4))
+        self.grid.setValue(4, 4, 1)
+        self.grid.restore(state)
+        self.assertEqual(self.grid.snapshot(), state)
+        self.assertFalse(self.grid.Rows[4].elements[4].final)
+        self.assertTrue(self.grid.events.empty())
+
+    def test_unset(self):
+        self.grid.enterValue(0, 0, 5)
+        self.grid.enterValue(4, 4, 1)
+        state = self.grid.snapshot()
+        self.grid.enterValue(0, 8, 7)
+        self.grid.unset(0, 8)
+        self.assertEqual(self.grid.snapshot(), state)
+        self.grid.unset(0, 0)
+        self.assertFalse(self.grid.Rows[0].elements[0].final)
+        self.assertEqual(self.grid.Rows[0].elements[0].cardinality(), 9)
+        self.assertTrue(self.grid.Rows[0].elements[1].member(5))
+        # 1 is still placed at 4, 4, so 4, 0 stays without it
+        self.assertFalse(self.grid.Rows[4].elements[0].member(1))
+
+    def test_unset_after_evaluate(self):
+        self.grid.load_string(EASY_PUZZLE)
+        # wrong, the solution has 4 there
+        self.grid.enterValue(0, 0, 5)
+        self.grid.guessing = True
+        self.grid.evaluate()
+        self.grid.guessing = False
+        evaluated = self.grid.snapshot()
+        self.grid.unset(0, 0)
+        for row in self.grid.Rows:
+            for element in row.elements:
+                right = int(EASY_SOLUTION[element.row * 9 + element.column])
+                self.assertTrue(element.member(right))
+                if element.final:
+                    self.assertEqual(list(element.values), [right])
+        self.assertFalse(self.grid.Rows[0].elements[0].final)
+        self.assertTrue(self.grid.undo())
+        self.assertEqual(self.grid.snapshot(), evaluated)
+        self.assertTrue(self.grid.redo())
+        self.grid.enterValue(0, 0, 4)
+        self.assertEqual(self.grid.evaluate(), SolveLimits.SOLVED)
+        self.assertEqual(self.grid.to_string(), EASY_SOLUTION)
+
+    def test_unset_edits_in_between(self):
+        self.grid.load_string(EASY_PUZZLE)
+        givens = self.grid.snapshot()
+        self.grid.enterValue(0, 0, 4)
+        self.grid.enterValue(0, 1, 8)
+        self.grid.unset(0, 1)
+        self.grid.unset(0, 0)
+        # nothing the user cleared is filled in again
+        self.assertEqual(self.grid.snapshot(), givens)
+        while self.grid.undo():
+            pass
+        self.assertEqual(self.grid.snapshot(), givens)
+
+    def test_unset_after_wrong_entry_unset(self):
+        puzzle = "2...6.1.....3....2..3.49..8.2....7........25..4..72..18.........59...674..6.....9"
+        solution = "294568137568317492713249568621985743987134256345672981872496315159823674436751829"
+        self.grid.load_string(puzzle)
+        # (1, 0) is wrong, the rules place (5, 2) from it
+        self.grid.enterValue(1, 0, 7)
+        self.grid.evaluate()
+        self.grid.unset(5, 2)
+        self.grid.enterValue(5, 2, 5)
+        self.grid.unset(1, 0)
+        self.grid.unset(5, 2)
+        for row in self.grid.Rows:
+            for element in row.elements:
+                right = int(solution[element.row * 9 + element.column])
+                self.assertTrue(element.member(right))
+                if element.final:
+                    self.assertEqual(list(element.values), [right])
+        self.assertEqual(self.grid.evaluate(), SolveLimits.SOLVED)
+        self.assertEqual(self.grid.to_string(), solution)
+
+    def test_unset_not_final(self):
+        self.grid.unset(0, 0)
+        self.assertEqual(self.grid.history, [])
+
+    def test_undo_redo(self):
+        empty = self.grid.snapshot()
+        self.grid.enterValue(0, 0, 5)
+        afterSet = self.grid.snapshot()
+        self.grid.unset(0, 0)
+        self.assertTrue(self.grid.undo())
+        self.assertEqual(self.grid.snapshot(), afterSet)
+        self.assertTrue(self.grid.undo())
+        self.assertEqual(self.grid.snapshot(), empty)
+        self.assertFalse(self.grid.undo())
+        self.assertTrue(self.grid.redo())
+        self.assertEqual(self.grid.snapshot(), afterSet)
+        self.grid.enterValue(8, 8, 9)
+        self.assertFalse(self.grid.redo())
+
+    def test_undo_reverts_rules(self):
+        loadTestGrid(self.grid, "testExpert1.csv")
+        givens = self.grid.snapshot()
+        self.grid.enterValue(0, 0, min(self.grid.Rows[0].elements[0].values))
+        self.grid.evaluate()
+        self.assertTrue(self.grid.undo())
+        self.assertEqual(self.grid.snapshot(), givens)
+
+    def test_candidate_masks(self):
+        self.grid.setValue(0, 0, 5)
+        masks = self.grid.candidateMasks()
+        self.assertEqual(masks[5] & SudokuV1.ROW_MASKS[0], 0)
+        self.assertEqual(masks[5] & SudokuV1.SUB_GRID_MASKS[0], 0)
+        self.assertEqual(masks[1], ((1 << 81) - 1) & ~1)
+
+    def test_pointing(self):
+        for row in (1, 2):
+            for col in range(3):
+                self.grid.Rows[row].elements[col].remove(4)
+        self.grid.pointingPairsRule(self.grid.SubGrid[0])
+        for col in range(9):
+            self.assertEqual(self.grid.Rows[0].elements[col].member(4), col < 3)
+        self.assertTrue(self.grid.Rows[1].elements[3].member(4))
+
+    def test_claiming(self):
+        for col in range(3, 9):
+            self.grid.Cols[col].elements[0].remove(4)
+        self.grid.lockedCandidatesRule()
+        for row in (1, 2):
+            for col in range(3):
+                self.assertFalse(self.grid.Rows[row].elements[col].member(4))
+        self.assertTrue(self.grid.Rows[3].elements[0].member(4))
+
+    def test_trace(self):
+        self.grid.load_string(EASY_PUZZLE)
+        trace = []
+        self.assertEqual(self.grid.evaluate(trace=trace), SolveLimits.SOLVED)
+        sets = [step for step in trace if step[1] == "set"]
+        self.assertEqual(len(sets), 49)
+        self.assertEqual(len(set(step[2] for step in sets)), 49)
+        for rule, kind, cells, val in sets:
+            row, col = cells[0]
+            self.assertEqual(list(self.grid.Rows[row].elements[col].values), [val])
+
+    def test_debug_flag(self):
+        # logging is at INFO, so the rules log nothing per change
+        self.assertFalse(self.grid.debug)
+        loadTestGrid(self.grid, "testExpert1.csv")
+        self.grid.debug = True
+        with self.assertLogs("sudoku", level="DEBUG") as logs:
+            self.grid.evaluate()
+        self.assertTrue(any("evaluating" in line for line in logs.output))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import logging
+from tests.puzzles import HARD_PUZZLE as PUZZLE, HARD_SOLUTION as SOLUTION
+
+try:
+    import numpy as np
+    from sudoku import Validate
+except ImportError:
+    np = None
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestValidate(unittest.TestCase):
+
+    def test_to_array(self):
+        fromStrings = Validate.toArray([PUZZLE, SOLUTION])
+        self.assertEqual(fromStrings.shape, (2, 81))
+        self.assertEqual(fromStrings[0, 2], 0)
+        self.assertEqual(fromStrings[1, 0], 4)
+        packed = bytes(int(char) for char in SOLUTION)
+        self.assertTrue((Validate.toArray(packed) == fromStrings[1]).all())
+        self.assertTrue((Validate.toArray(SOLUTION.encode()) == fromStrings[1]).all())
+        self.assertTrue((Validate.toArray(fromStrings.reshape(2, 9, 9)) == fromStrings).all())
+
+    def test_to_array_characters_in_array(self):
+        fromString = Validate.toArray(SOLUTION)
+        ascii = np.frombuffer(SOLUTION.encode(), dtype=np.uint8).copy()
+        self.assertTrue((Validate.toArray(ascii) == fromString).all())
+        valid, badUnits, badGivens = Validate.validateBatch(ascii.reshape(1, 81), givens=PUZZLE)
+        self.assertTrue(valid[0])
+
+    def test_to_array_out_of_range(self):
+        grid = Validate.toArray(SOLUTION).astype(np.int64)
+        # 260 would wrap round to 4, the right value here, in a plain cast
+        self.assertEqual(grid[0, 0], 4)
+        for bad in (260, -252, 10):
+            wrong = grid.copy()
+            wrong[0, 0] = bad
+            valid, badUnits, badGivens = Validate.validateBatch(wrong)
+            self.assertFalse(valid[0])
+
+    def test_to_array_mixed(self):
+        # a bad byte in one grid of a packed buffer says nothing about the others
+        packed = bytes(int(char) for char in SOLUTION) + b"x" * 81
+        valid, badUnits, badGivens = Validate.validateBatch(packed)
+        self.assertEqual(valid.tolist(), [True, False])
+
+    def test_to_array_bad_size(self):
+        with self.assertRaises(ValueError):
+            Validate.toArray(SOLUTION[:80].encode())
+
+    def test_to_array_bad_length(self):
+        # the lengths add up to whole grids, the grids are still wrong
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION[:80], SOLUTION[80] + SOLUTION, SOLUTION])
+        self.assertEqual(valid.tolist(), [False, False, True])
+        valid, badUnits, badGivens = Validate.validateBatch(["", SOLUTION + SOLUTION, SOLUTION])
+        self.assertEqual(valid.tolist(), [False, False, True])
+
+    def test_to_array_not_ascii(self):
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION, "٤" + SOLUTION[1:]])
+        self.assertEqual(valid.tolist(), [True, False])
+
+    def test_valid(self):
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION] * 3, givens=PUZZLE)
+        self.assertTrue(valid.all())
+        self.assertFalse(badUnits.any())
+        self.assertFalse(badGivens.any())
+
+    def test_offending_units(self):
+        empty = "." + SOLUTION[1:]
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION, empty, "x" * 81])
+        self.assertEqual(valid.tolist(), [True, False, False])
+        self.assertEqual(np.flatnonzero(badUnits[1]).tolist(), [0, 9, 18])
+        self.assertTrue(badUnits[2].all())
+
+    def test_swapped_columns(self):
+        # swapping two cells of a row breaks their columns, not the row or sub-grid
+        swapped = SOLUTION[1] + SOLUTION[0] + SOLUTION[2:]
+        valid, badUnits, badGivens = Validate.validateBatch([swapped])
+        self.assertFalse(valid[0])
+        self.assertEqual(np.flatnonzero(badUnits[0]).tolist(), [9, 10])
+
+    def test_givens(self):
+        # a valid grid, but not the solution to PUZZLE
+        relabeled = SOLUTION.translate(str.maketrans("12", "21"))
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION, relabeled], givens=[PUZZLE, PUZZLE])
+        self.assertEqual(valid.tolist(), [True, False])
+        self.assertFalse(badUnits.any())
+        self.assertEqual(badGivens.tolist(), [False, True])
+        valid, badUnits, badGivens = Validate.validateBatch([SOLUTION, relabeled], givens=PUZZLE)
+        self.assertEqual(badGivens.tolist(), [False, True])
+
+    def test_many_chunks(self):
+        grids = np.tile(Validate.toArray(SOLUTION), (Validate.CHUNK * 2 + 5, 1))
+        grids[Validate.CHUNK + 3, 40] = 0
+        valid, badUnits, badGivens = Validate.validateBatch(grids, givens=PUZZLE)
+        self.assertEqual(np.flatnonzero(~valid).tolist(), [Validate.CHUNK + 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import logging
+from sudoku import SudokuV1
+from sudoku import Zobrist
+
+logging.basicConfig(filename='SudokuSolver.log',
+                    format='%(asctime)s %(message)s',
+                    filemode='w',
+                    level=logging.INFO)
+
+class TestZobrist(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SudokuV1.Grid(hashing=True)
+
+    def assertHashCurrent(self):
+        expected = Zobrist.ZobristHash()
+        expected.recompute(self.grid)
+        self.assertEqual(self.grid.zobrist.value, expected.value)
+
+    def test_keys_fixed(self):
+        self.assertEqual(Zobrist.KEYS, Zobrist.makeKeys(1729))
+        self.assertEqual(len(set(key for keys in Zobrist.KEYS for key in keys[1:])), 729)
+
+    def test_off_by_default(self):
+        grid = SudokuV1.Grid()
+        self.assertIsNone(grid.zobrist)
+        grid.setValue(0, 0, 5)
+        grid.unset(0, 0)
+        grid.rollback(0)
+
+    def test_incremental(self):
+        self.grid.setValue(0, 0, 5)
+        self.grid.Rows[4].elements[4].remove(3)
+        self.assertHashCurrent()
+        self.grid.unset(0, 0)
+        self.assertHashCurrent()
+
+    def test_order_independent(self):
+        self.grid.setValue(0, 0, 5)
+        self.grid.setValue(4, 4, 1)
+        other = SudokuV1.Grid(hashing=True)
+        other.setValue(4, 4, 1)
+        other.setValue(0, 0, 5)
+        self.assertEqual(self.grid.zobrist.value, other.zobrist.value)
+
+    def test_rollback_and_restore(self):
+        empty = self.grid.zobrist.value
+        state = self.grid.snapshot()
+        self.grid.setValue(0, 0, 5)
+        self.grid.rollback(0)
+        self.assertEqual(self.grid.zobrist.value, empty)
+        self.grid.setValue(0, 0, 5)
+        self.grid.restore(state)
+        self.assertEqual(self.grid.zobrist.value, empty)
+
+if __name__ == '__main__':
+    unittest.main()